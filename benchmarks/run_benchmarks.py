@@ -0,0 +1,249 @@
+"""Benchmarks of the example pipelines on synthetic data of increasing size.
+
+Every headless example pipeline in vai_lab/examples/xml_files and every
+config in benchmarks/configs is run once per scale. Its data files are
+replaced by synthetic data with the same schema, see synthetic.py. Each
+run happens in a fresh process, so timings include cold starts and peak RSS
+is not carried over between runs. Time and memory of each module are taken
+from Core's instrumentation.
+
+Results are compared against the baseline benchmarks/baseline.json by default.
+Timings depend on the machine, so the baseline is not part of the repository:
+record it with --record on the machine the comparison runs on. Regressions are
+only reported against a baseline recorded in the same environment.
+
+Usage:
+    python benchmarks/run_benchmarks.py --record
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scales 10000 100000 1000000 --output results.json
+
+Pipelines which need a display or a simulator are skipped. The optimisation
+schema is capped at --optimisation-rows because the Gaussian process scales
+cubically, and image folders hold --images images regardless of the scale.
+"""
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from synthetic import SCHEMAS, generate
+
+_BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+_BASELINE = os.path.join(_BENCH_DIR, "baseline.json")
+_DATA_PATH = re.compile(r'(file|folder)="\./examples/([^/"]+)/')
+_OUTPATH = re.compile(r"(<outpath>\s*)(\S+?)(\s*</outpath>)")
+# Modules which need a display or a simulator
+_NOT_HEADLESS = ("<UserInteraction", "<Environment")
+
+
+def find_pipelines(names: Optional[List[str]] = None) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Collects the pipelines that can be benchmarked
+
+    :param names [optional]: list of pipeline names to keep, all by default
+    :returns: dict of name to config file, dict of skipped names to the reason
+    """
+    from vai_lab._import_helper import get_lib_parent_dir
+    files = sorted(glob.glob(os.path.join(get_lib_parent_dir(), "examples", "xml_files", "*.xml"))) \
+        + sorted(glob.glob(os.path.join(_BENCH_DIR, "configs", "*.xml")))
+    pipelines, skipped = {}, {}
+    for filename in files:
+        name = os.path.splitext(os.path.basename(filename))[0]
+        if names and name not in names:
+            continue
+        with open(filename) as f:
+            config = f.read()
+        schemas = {schema for _, schema in _DATA_PATH.findall(config)}
+        if any(tag in config for tag in _NOT_HEADLESS):
+            skipped[name] = "needs a display or a simulator"
+        elif not schemas:
+            skipped[name] = "loads no example data"
+        elif not schemas <= set(SCHEMAS):
+            skipped[name] = "no synthetic data for {0}".format(", ".join(schemas - set(SCHEMAS)))
+        else:
+            pipelines[name] = filename
+    return pipelines, skipped
+
+
+def _schema_rows(schema: str, rows: int, args) -> int:
+    if schema == "optimisation":
+        return min(rows, args.optimisation_rows)
+    if schema == "image_classification":
+        return args.images
+    return rows
+
+
+def prepare_config(filename: str, rows: int, args, work_dir: str) -> str:
+    """Writes a copy of a config which reads synthetic data and writes its
+    output to work_dir
+
+    :returns: str, filename of the copy
+    """
+    with open(filename) as f:
+        config = f.read()
+
+    def data_dir(match):
+        schema = match.group(2)
+        directory = generate(schema, args.data_dir, _schema_rows(schema, rows, args), args.seed)
+        return '{0}="{1}/'.format(match.group(1), directory.replace(os.sep, "/"))
+
+    config = _DATA_PATH.sub(data_dir, config)
+    config = _OUTPATH.sub(lambda m: m.group(1) + os.path.join(work_dir, "output.pkl") + m.group(3),
+                          config)
+    out = os.path.join(work_dir, os.path.basename(filename))
+    with open(out, "w") as f:
+        f.write(config)
+    return out
+
+
+def _run_pipeline(filename: str, trace_memory: bool) -> Dict:
+    """Runs a pipeline headless in the current process"""
+    import io
+    from contextlib import redirect_stdout
+    import vai_lab as ai
+
+    start = time.perf_counter()
+    core = ai.Core(headless=True)
+    instrumentation = core.enable_instrumentation(trace_memory=trace_memory)
+    with redirect_stdout(io.StringIO()):
+        core.load_config_file(filename)
+        core.run()
+    total = time.perf_counter() - start
+
+    modules = {}
+    for span in instrumentation.spans:
+        if span["category"] in ("module", "data"):
+            modules[span["name"]] = {key: span[key] for key in ("duration", "max_rss", "mem_peak")
+                                     if span.get(key) is not None}
+            modules[span["name"]].update(span["args"])
+    return {"total": total,
+            "max_rss": max([s["max_rss"] or 0 for s in instrumentation.spans], default=0),
+            "modules": modules,
+            "plugins": {name: s for name, s in instrumentation.summary().items()
+                        if s["category"] == "plugin"}}
+
+
+def run(args) -> Dict:
+    pipelines, skipped = find_pipelines(args.pipelines)
+    for name, reason in skipped.items():
+        print("skipping {0}: {1}".format(name, reason))
+    results = {"environment": {"python": platform.python_version(),
+                               "platform": platform.platform(),
+                               "processor": platform.processor(),
+                               "cpu_count": os.cpu_count()},
+               "runs": {}}
+    ctx = mp.get_context("spawn")
+    for rows in args.scales:
+        for name, filename in pipelines.items():
+            key = "{0}@{1}".format(name, rows)
+            with tempfile.TemporaryDirectory() as work_dir:
+                config = prepare_config(filename, rows, args, work_dir)
+                print("running {0} ...".format(key), end=" ", flush=True)
+                try:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                        result = pool.submit(_run_pipeline, config, args.trace_memory).result()
+                except Exception as exc:
+                    print("failed: {0}: {1}".format(type(exc).__name__, exc))
+                    results["runs"][key] = {"error": "{0}: {1}".format(type(exc).__name__, exc)}
+                    continue
+            print("{0:.2f}s".format(result["total"]))
+            results["runs"][key] = result
+    return results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float, min_seconds: float) -> List[str]:
+    """Compares durations of all runs and modules present in both.
+    A duration regressed if it is more than tolerance (relative) and
+    min_seconds (absolute) slower than in the baseline
+
+    :returns: list of regressions
+    """
+    regressions = []
+    print("\n{0:<60} {1:>10} {2:>10} {3:>8}".format("run / module", "baseline", "current", "ratio"))
+    for key, run in results["runs"].items():
+        base = baseline.get("runs", {}).get(key)
+        if base is None or "error" in run or "error" in base:
+            continue
+        items = [(key, base["total"], run["total"])]
+        items += [("  " + module, base["modules"][module]["duration"], stats["duration"])
+                  for module, stats in run["modules"].items() if module in base["modules"]]
+        for label, before, now in items:
+            ratio = now / before if before > 0 else float("inf")
+            flag = ""
+            if now > before * (1 + tolerance) and now - before > min_seconds:
+                flag = "  REGRESSION"
+                regressions.append("{0}: {1:.3f}s -> {2:.3f}s".format(label.strip(), before, now))
+            print("{0:<60} {1:>9.3f}s {2:>9.3f}s {3:>8.2f}{4}".format(label, before, now, ratio, flag))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000],
+                        help="training rows of the synthetic datasets, e.g. 10000 to 10000000")
+    parser.add_argument("--pipelines", type=str, nargs="+", default=None,
+                        help="names of the pipelines to run, all by default")
+    parser.add_argument("--data-dir", type=str,
+                        default=os.path.join(tempfile.gettempdir(), "vai_lab_benchmark_data"),
+                        help="directory where synthetic datasets are generated and reused")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--images", type=int, default=200,
+                        help="number of images in synthetic image folders")
+    parser.add_argument("--optimisation-rows", type=int, default=500,
+                        help="maximum rows of the synthetic optimisation data")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="measure allocations of each module with tracemalloc, slows runs down")
+    parser.add_argument("--output", type=str, default=None,
+                        help="JSON file the results are written to")
+    parser.add_argument("--baseline", type=str, default=_BASELINE,
+                        help="JSON file of earlier results to compare against, "
+                             "benchmarks/baseline.json by default")
+    parser.add_argument("--record", action="store_true",
+                        help="write the results to the baseline file instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="absolute slowdown below which differences are ignored")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.record:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1)
+        print("\nBaseline recorded in {0}".format(args.baseline))
+        return 0
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline {0}, record one with --record".format(args.baseline))
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != results["environment"]:
+        # Timings of different machines are not comparable, they are only listed
+        compare(results, baseline, float("inf"), args.min_seconds)
+        print("\nThe baseline was recorded on another machine, regressions are not checked: {0}"
+              .format(baseline.get("environment")))
+        print("Record a baseline on this machine with --record")
+        return 0
+    regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+    if regressions:
+        print("\n{0} regressions:\n".format(len(regressions)) + "\n".join(regressions))
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Synthetic datasets with the schemas of the example data in vai_lab/examples.
+
+Each writer creates the same file names and column headers as the example
+folder it replaces, so example pipelines can be pointed at the generated
+data by replacing the folder in their file paths.
+"""
+import os
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Rows written per call of DataFrame.to_csv, bounds memory for large datasets
+_CHUNK_ROWS = 2**20
+
+
+def _write_csv(filenames: List[str], rows: int,
+               make_chunk: Callable[[np.random.Generator, int], Tuple[pd.DataFrame, ...]],
+               rng: np.random.Generator) -> None:
+    """Writes rows generated by make_chunk(rng, n) in chunks.
+    make_chunk returns one DataFrame of n rows per file
+    """
+    for start in range(0, rows, _CHUNK_ROWS):
+        n = min(_CHUNK_ROWS, rows - start)
+        for filename, df in zip(filenames, make_chunk(rng, n)):
+            df.to_csv(filename, mode="w" if start == 0 else "a",
+                      header=start == 0, index=False)
+
+
+def _supervised(directory: str, rows: int, seed: int, target: Callable) -> None:
+    """X_tr, Y_tr, X_tst, Y_tst of 5 uniform features and target(rng, X).
+    As in the examples, the test set has 2/3 the rows of the training set
+    """
+    columns = [str(i) for i in range(5)]
+
+    def make_chunk(rng, n):
+        X = rng.random((n, len(columns)))
+        return pd.DataFrame(X, columns=columns), pd.DataFrame({"0": target(rng, X)})
+
+    for split, n, offset in (("tr", rows, 1), ("tst", max(1, rows*2//3), 2)):
+        _write_csv([os.path.join(directory, "X_{0}.csv".format(split)),
+                    os.path.join(directory, "Y_{0}.csv".format(split))],
+                   n, make_chunk, np.random.default_rng([seed, offset]))
+
+
+def supervised_regression(directory: str, rows: int, seed: int = 0) -> None:
+    """Noisy linear target"""
+    weights = np.random.default_rng(seed).uniform(0, 3, 5)
+    _supervised(directory, rows, seed,
+                lambda rng, X: X @ weights + rng.normal(0, 0.1, len(X)))
+
+
+def supervised_classification(directory: str, rows: int, seed: int = 0) -> None:
+    """Binary labels of a noisy linear boundary"""
+    weights = np.random.default_rng(seed).normal(0, 1, 5)
+    _supervised(directory, rows, seed,
+                lambda rng, X: ((X - 0.5) @ weights + rng.logistic(0, 0.2, len(X)) > 0).astype(int))
+
+
+def state_action(directory: str, rows: int, seed: int = 0) -> None:
+    """X_data of canvas states and actions"""
+    columns = ["State_x", "State_y", "Action_x", "Action_y"]
+    _write_csv([os.path.join(directory, "X_data.csv")], rows,
+               lambda rng, n: (pd.DataFrame(rng.uniform(0, 600, (n, 4)), columns=columns),),
+               np.random.default_rng(seed))
+
+
+def optimisation(directory: str, rows: int, seed: int = 0) -> None:
+    """X of compositions summing to 1 and Y of their merit"""
+    rng = np.random.default_rng(seed)
+    X = rng.dirichlet(np.ones(3), rows)
+    merit = 5e5 * np.exp(-np.sum((X - [0.2, 0.3, 0.5])**2, axis=1) / 0.1) \
+        + rng.normal(0, 1e4, rows)
+    pd.DataFrame(X, columns=["CsPbI", "MAPbI", "FAPbI"]).to_csv(
+        os.path.join(directory, "X.csv"), index=False)
+    pd.DataFrame({"merit": merit}).to_csv(os.path.join(directory, "Y.csv"), index=False)
+
+
+def image_classification(directory: str, rows: int, seed: int = 0, size: int = 128) -> None:
+    """training_images folder with rows png images and Y_data of their classes"""
+    import cv2
+    classes = ["Atelectasis", "Cardiomelagy", "Effusion", "Infiltration", "Mass", "Nodule"]
+    rng = np.random.default_rng(seed)
+    folder = os.path.join(directory, "training_images")
+    os.makedirs(folder, exist_ok=True)
+    yy, xx = np.mgrid[:size, :size]
+    for i in range(rows):
+        centre = rng.uniform(0, size, 2)
+        blob = 255 * np.exp(-((yy - centre[0])**2 + (xx - centre[1])**2) / (0.05 * size**2))
+        img = np.clip(blob + rng.normal(0, 20, (size, size)), 0, 255).astype(np.uint8)
+        cv2.imwrite(os.path.join(folder, "{0:08d}_000.png".format(i)),
+                    np.repeat(img[..., None], 3, axis=2))
+    with open(os.path.join(directory, "Y_data.csv"), "w") as f:
+        f.write("Class,\n")
+        f.writelines("{0},\n".format(c) for c in rng.choice(classes, rows))
+
+
+SCHEMAS: Dict[str, Callable] = {"supervised_regression": supervised_regression,
+                                "supervised_classification": supervised_classification,
+                                "state-action": state_action,
+                                "optimisation": optimisation,
+                                "image_classification": image_classification}
+
+
+def generate(schema: str, data_dir: str, rows: int, seed: int = 0) -> str:
+    """Generates a dataset once. Later calls with the same arguments reuse it
+
+    :param schema: str, name of an example data folder, see SCHEMAS
+    :param data_dir: str, root directory of generated datasets
+    :param rows: int, number of training rows, or of images
+    :param seed [optional]: int, seed of the random generator
+    :returns: str, directory replacing vai_lab/examples/<schema>
+    """
+    directory = os.path.join(data_dir, "{0}_{1}_seed{2}".format(schema, rows, seed))
+    done = os.path.join(directory, ".complete")
+    if not os.path.exists(done):
+        os.makedirs(directory, exist_ok=True)
+        SCHEMAS[schema](directory, rows, seed)
+        open(done, "w").close()
+    return directory
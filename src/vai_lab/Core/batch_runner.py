@@ -0,0 +1,111 @@
+"""Runs many pipeline config files, one after another or in worker processes.
+
+Each process creates a single Core and resets it between config files, so
+the plugin registry and imported plugins are reused by all pipelines.
+"""
+import time
+from os.path import abspath
+from typing import Dict, List, Optional
+
+from vai_lab.Core.vai_lab_core import Core
+
+_worker_core: Optional[Core] = None
+
+
+def _new_core(headless: bool,
+              max_workers: int,
+              cache_dir: Optional[str],
+              fuse_processing: bool = False) -> Core:
+    core = Core(headless=headless, max_workers=max_workers, fuse_processing=fuse_processing)
+    if cache_dir:
+        core.enable_result_cache(cache_dir)
+    return core
+
+
+def _init_worker(max_workers: int, cache_dir: Optional[str], fuse_processing: bool) -> None:
+    global _worker_core
+    _worker_core = _new_core(True, max_workers, cache_dir, fuse_processing)
+
+
+def _run_config(core: Core, filename: str) -> Dict:
+    """Runs one config file with core and reports the outcome.
+    Errors are caught so that one failing pipeline does not stop the batch.
+
+    :param core: Core, reset before the pipeline is loaded
+    :param filename: str, pipeline config file
+    :returns: dict with file, status ("ok" or "failed"), duration in seconds and error
+    """
+    core.reset()
+    start = time.perf_counter()
+    try:
+        core.load_config_file(filename)
+        core.run()
+        status, error = "ok", None
+    except (Exception, SystemExit) as exc:
+        status, error = "failed", "{0}: {1}".format(type(exc).__name__, exc)
+    return {"file": filename,
+            "status": status,
+            "duration": time.perf_counter() - start,
+            "error": error}
+
+
+def _run_in_worker(filename: str) -> Dict:
+    return _run_config(_worker_core, filename)
+
+
+class BatchRunner:
+    def __init__(self,
+                 headless: bool = True,
+                 processes: int = 1,
+                 max_workers: int = 1,
+                 cache_dir: str = None,
+                 fuse_processing: bool = False) -> None:
+        """
+        :param headless [optional]: bool, run without progress tracker.
+                        Concurrent batches are always headless
+        :param processes [optional]: int, number of config files run concurrently,
+                        each in its own worker process
+        :param max_workers [optional]: int, threads running independent modules
+                        within each pipeline
+        :param cache_dir [optional]: str, result cache shared by all pipelines
+        :param fuse_processing [optional]: bool, fuse chains of DataProcessing
+                        modules, see Core
+        """
+        self.headless = headless
+        self.processes = processes
+        self.max_workers = max_workers
+        self.cache_dir = abspath(cache_dir) if cache_dir else None
+        self.fuse_processing = fuse_processing
+        self._core: Optional[Core] = None
+
+    def run(self, files: List[str]) -> List[Dict]:
+        """Runs each config file as a separate pipeline
+
+        :param files: list of config file names
+        :returns: list of results of _run_config, in the order of files
+        """
+        files = [abspath(f) for f in files]
+        if self.processes > 1 and len(files) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=self.processes,
+                                     initializer=_init_worker,
+                                     initargs=(self.max_workers,
+                                               self.cache_dir,
+                                               self.fuse_processing)) as pool:
+                return list(pool.map(_run_in_worker, files))
+        if self._core is None:
+            self._core = _new_core(self.headless, self.max_workers,
+                                   self.cache_dir, self.fuse_processing)
+        return [_run_config(self._core, f) for f in files]
+
+    @staticmethod
+    def summary(results: List[Dict]) -> str:
+        """Readable report of the results of run"""
+        failed = [r for r in results if r["status"] != "ok"]
+        lines = ["{0:<7} {1:>9.2f}s  {2}".format(r["status"], r["duration"], r["file"])
+                 for r in results]
+        lines += ["{0}: {1}".format(r["file"], r["error"]) for r in failed]
+        lines.append("{0} pipelines, {1} succeeded, {2} failed, {3:.2f}s in total"
+                     .format(len(results), len(results) - len(failed), len(failed),
+                             sum(r["duration"] for r in results)))
+        return "\n".join(lines)
@@ -0,0 +1,81 @@
+"""Stream of pipeline progress events published by Core.
+
+Events are plain dicts so they can be passed to other threads or processes:
+    event: str, "pipeline_start", "start", "finish" or "pipeline_finish"
+    name: str, name of the module or loop (elements only)
+    class: str, "module", "loop", "entry_point" or "exit_point" (elements only)
+    time: float, wall clock time of the event as given by time.time()
+    duration: float, seconds since the matching start event (finish events only)
+    data_size: int, bytes of arrays in the module output ("finish" of modules only)
+"""
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, List
+
+from vai_lab.Data.Data_core import is_sparse
+from vai_lab.Data.image_store import LazyImageDict
+
+
+def data_nbytes(obj: Any) -> int:
+    """Approximate memory held by the arrays in obj.
+    Recurses through Data objects, dicts, lists and tuples. Other objects count as 0
+
+    :param obj: Data object, DataFrame, numpy array, scipy.sparse matrix or container of them
+    :returns: int number of bytes
+    """
+    import numpy as np
+    import pandas as pd  # type: ignore
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if is_sparse(obj):
+        # Stored values and index arrays of any sparse format
+        return sum(int(getattr(obj, attr).nbytes)
+                   for attr in ("data", "indices", "indptr", "row", "col", "offsets")
+                   if isinstance(getattr(obj, attr, None), np.ndarray))
+    if isinstance(obj, LazyImageDict):
+        # Only images held in memory are counted, nothing is decoded
+        return data_nbytes(list(obj._cache.values())) + data_nbytes(list(obj._items.values()))
+    if hasattr(obj, "keys") and hasattr(obj, "__getitem__"):
+        return sum(data_nbytes(obj[key]) for key in obj.keys())
+    if isinstance(obj, (list, tuple)):
+        return sum(data_nbytes(item) for item in obj)
+    return 0
+
+
+class EventStream:
+    """Thread-safe publisher of progress events.
+    Subscribers are called synchronously in the publishing thread, so they
+    should only hand the event over, e.g. put it into a queue.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._lock = Lock()
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> None:
+        """:param callback: function called with each published event dict"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event: str, **info) -> Dict:
+        """Sends an event to all subscribers
+
+        :param event: str, type of event
+        :param info: further fields of the event
+        :returns: dict of the published event
+        """
+        msg = {"event": event, "time": time.time(), **info}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(msg)
+        return msg
@@ -0,0 +1,171 @@
+"""Timing and memory instrumentation of pipeline runs.
+
+While an Instrumentation is active, spans are recorded around modules, data
+loading and the fit/transform/predict/score methods of plugins. Each span
+is a plain dict:
+    name: str, module name or plugin method, e.g. "Ridge.fit"
+    category: str, "module", "data" or "plugin"
+    start: float, seconds since the instrumentation was created
+    duration: float, seconds, measured with time.perf_counter
+    thread: int, thread identifier
+    max_rss: int, peak resident memory of the process in bytes at the end
+        of the span, if the platform reports it
+    mem_peak: int, bytes allocated at the peak of the span above the
+        allocation at its start (trace_memory only)
+    mem_delta: int, bytes still allocated at the end of the span (trace_memory only)
+    args: dict of further information, e.g. input_size and output_size of modules
+
+Memory is traced with tracemalloc, which is process-wide: with concurrent
+modules, peaks include allocations of the other threads.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+_active: Optional["Instrumentation"] = None
+
+
+def _max_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class Instrumentation:
+    def __init__(self, trace_memory: bool = False) -> None:
+        """
+        :param trace_memory [optional]: bool, measure allocations with tracemalloc.
+                        Slows down execution noticeably
+        """
+        self.trace_memory = trace_memory
+        self.spans: List[Dict] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def activate(self) -> Iterator["Instrumentation"]:
+        """Records spans of everything run inside the with block"""
+        global _active
+        previous, _active = _active, self
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            yield self
+        finally:
+            if started:
+                tracemalloc.stop()
+            _active = previous
+
+    @contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[Dict]:
+        """Records the duration and memory use of the with block.
+        Further information can be added to the "args" of the yielded span
+        """
+        stack = self._local.__dict__.setdefault("stack", [])
+        record = {"name": name,
+                  "category": category,
+                  "thread": threading.get_ident(),
+                  "args": dict(args)}
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the peak seen so far for the enclosing span before resetting it
+            if stack:
+                stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+            tracemalloc.reset_peak()
+            record["_start_mem"], record["_peak"] = current, current
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            record["start"] = start - self._origin
+            record["duration"] = end - start
+            record["max_rss"] = _max_rss()
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(record.pop("_peak"), peak)
+                start_mem = record.pop("_start_mem")
+                record["mem_peak"] = peak - start_mem
+                record["mem_delta"] = current - start_mem
+                if stack:
+                    stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+            with self._lock:
+                self.spans.append(record)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Total duration and number of calls of each span name"""
+        out: Dict[str, Dict] = {}
+        for s in self.spans:
+            entry = out.setdefault(s["name"], {"category": s["category"],
+                                               "calls": 0,
+                                               "duration": 0.0})
+            entry["calls"] += 1
+            entry["duration"] += s["duration"]
+            if "mem_peak" in s:
+                entry["mem_peak"] = max(entry.get("mem_peak", 0), s["mem_peak"])
+        return out
+
+    def to_json(self, filename: str) -> None:
+        """Writes all spans and their summary to a JSON file"""
+        with open(filename, "w") as f:
+            json.dump({"spans": self.spans, "summary": self.summary()}, f, indent=1, default=str)
+
+    def to_chrome_trace(self, filename: str) -> None:
+        """Writes the spans in the Chrome trace event format,
+        which can be opened with chrome://tracing or https://ui.perfetto.dev
+        """
+        pid = os.getpid()
+        events = []
+        for s in self.spans:
+            args = {k: v for k, v in s.items()
+                    if k in ("max_rss", "mem_peak", "mem_delta") and v is not None}
+            args.update(s["args"])
+            events.append({"name": s["name"],
+                           "cat": s["category"],
+                           "ph": "X",
+                           "ts": s["start"] * 1e6,
+                           "dur": s["duration"] * 1e6,
+                           "pid": pid,
+                           "tid": s["thread"],
+                           "args": args})
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+@contextmanager
+def span(name: str, category: str, **args) -> Iterator[Optional[Dict]]:
+    """Span of the active Instrumentation. Yields None if none is active"""
+    if _active is None:
+        yield None
+    else:
+        with _active.span(name, category, **args) as record:
+            yield record
+
+
+def instrumented(method: Callable) -> Callable:
+    """Records a span named <plugin class>.<method> for each call of a plugin method"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _active is None:
+            return method(self, *args, **kwargs)
+        with _active.span("{0}.{1}".format(type(self).__name__, method.__name__), "plugin"):
+            return method(self, *args, **kwargs)
+    return wrapper
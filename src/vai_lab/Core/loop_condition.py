@@ -0,0 +1,145 @@
+"""Conditions of while and until loops.
+
+A condition is a Python expression evaluated after each iteration of a loop.
+Only the following names are available and no other Python code can be run:
+    iteration: int, number of completed iterations
+    elapsed: float, seconds since the loop started
+    value(module, name): item `name` of the output data of `module`.
+        Single values are returned as float, anything else as numpy array
+    improvement(module, name, k): change of value(module, name) over the
+        last k iterations. inf until k iterations have been recorded.
+        Values are recorded after every iteration, also when the call is
+        skipped by a short-circuiting and/or
+    min, max, mean, abs, len: of numbers or arrays
+
+Examples:
+    value("Modelling", "test_score") < 0.95
+    abs(improvement("Modelling", "test_score", 3)) > 1e-3 and elapsed < 600
+"""
+import ast
+import math
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class LoopConditionError(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+_ALLOWED_NODES = (ast.Expression, ast.BoolOp, ast.And, ast.Or,
+                  ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+                  ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv,
+                  ast.Mod, ast.Pow,
+                  ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+                  ast.Call, ast.Name, ast.Load, ast.Constant)
+
+
+def _reduce(func: str) -> Callable:
+    """Applies the numpy function func to a single array-like argument or to several numbers"""
+    def reduced(*args):
+        import numpy as np
+        if len(args) == 1:
+            return float(getattr(np, func)(np.asarray(args[0], dtype=float)))
+        return float(getattr(np, func)(np.asarray(args, dtype=float)))
+    return reduced
+
+
+class LoopCondition:
+    def __init__(self, expression: str, data: Dict) -> None:
+        """Parses and validates a loop condition
+
+        :param expression: str, condition as given in the XML config
+        :param data: dict of module names to Data objects, e.g. Core.data
+        """
+        self.expression = expression.strip()
+        self._data = data
+        self._history: Dict[Tuple[str, str], List[float]] = {}
+        self._recorded: Dict[Tuple[str, str], int] = {}
+        self.iteration = 0
+        self.elapsed = 0.0
+        self._names = {"value": self.value,
+                       "improvement": self.improvement,
+                       "min": _reduce("min"),
+                       "max": _reduce("max"),
+                       "mean": _reduce("mean"),
+                       "abs": abs,
+                       "len": len}
+        tree = self._validate(self.expression)
+        self._tracked = self._improvement_args(tree)
+        self._code = compile(tree, "<loop condition>", "eval")
+
+    def _validate(self, expression: str) -> ast.Expression:
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError:
+            raise LoopConditionError(
+                "Loop condition \"{0}\" is not a valid expression".format(expression))
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise LoopConditionError(
+                    "Loop condition \"{0}\" uses unsupported syntax: {1}"
+                    .format(expression, type(node).__name__))
+            if isinstance(node, ast.Name) \
+                    and node.id not in self._names and node.id not in ("iteration", "elapsed"):
+                raise LoopConditionError(
+                    "Loop condition \"{0}\" uses unknown name \"{1}\"".format(expression, node.id))
+            if isinstance(node, ast.Call) \
+                    and not (isinstance(node.func, ast.Name) and node.func.id in self._names):
+                raise LoopConditionError(
+                    "Loop condition \"{0}\" may only call: {1}"
+                    .format(expression, ", ".join(self._names)))
+        return tree
+
+    def _improvement_args(self, tree: ast.Expression) -> List[Tuple[str, str]]:
+        """(module, name) of all improvement calls given as constants"""
+        tracked = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and node.func.id == "improvement" \
+                    and len(node.args) >= 2 \
+                    and all(isinstance(arg, ast.Constant) for arg in node.args[:2]):
+                key = (node.args[0].value, node.args[1].value)
+                if key not in tracked:
+                    tracked.append(key)
+        return tracked
+
+    def _record(self, module: str, name: str) -> None:
+        """Appends the current value to the history, once per iteration"""
+        if self._recorded.get((module, name)) != self.iteration:
+            self._history.setdefault((module, name), []).append(float(self.value(module, name)))
+            self._recorded[(module, name)] = self.iteration
+
+    def value(self, module: str, name: str) -> Any:
+        if module not in self._data or name not in self._data[module].keys():
+            raise LoopConditionError(
+                "Loop condition \"{0}\": no data \"{1}\" in module \"{2}\""
+                .format(self.expression, name, module))
+        import numpy as np
+        val = np.asarray(self._data[module][name])
+        if val.size == 1:
+            return float(val.reshape(-1)[0])
+        return val
+
+    def improvement(self, module: str, name: str, k: int = 1) -> float:
+        self._record(module, name)
+        history = self._history[(module, name)]
+        current = history[-1]
+        if len(history) <= k:
+            return math.inf
+        return current - history[-1 - k]
+
+    def evaluate(self, iteration: int, elapsed: float) -> bool:
+        """Evaluates the condition after an iteration
+
+        :param iteration: int, number of completed iterations
+        :param elapsed: float, seconds since the loop started
+        :returns: bool
+        """
+        self.iteration = iteration
+        self.elapsed = elapsed
+        for module, name in self._tracked:
+            if module in self._data and name in self._data[module].keys():
+                self._record(module, name)
+        out = bool(eval(self._code,
+                        {"__builtins__": {}},
+                        {**self._names, "iteration": iteration, "elapsed": elapsed}))
+        return out
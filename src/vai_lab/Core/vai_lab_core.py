@@ -1,30 +1,136 @@
+import threading
 import time
 from sys import exit
+from copy import deepcopy
+from contextlib import nullcontext
 from os.path import join
-from typing import Dict, List, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import pickle
 
 from vai_lab._import_helper import import_module, rel_to_abs
 from vai_lab._plugin_helpers import PluginSpecs
 from vai_lab._types import ModuleInterface, PluginSpecsInterface
-from vai_lab.GUI.GUI_core import GUI
 from vai_lab.Data.Data_core import Data
 from vai_lab.Data.xml_handler import XML_handler
+from vai_lab.Data.pipeline_plan import PipelinePlan, PlanPlugins, load_plan, walk_elements
+from vai_lab.Core.events import EventStream, data_nbytes
+from vai_lab.Core.instrumentation import Instrumentation, span
+from vai_lab.Core.loop_condition import LoopCondition, LoopConditionError
+
+if TYPE_CHECKING:
+    from vai_lab.Data.result_cache import ResultCache
+
+
+def _execute_loop_iteration(modules: Dict,
+                            plan: Union[PipelinePlan, None],
+                            data: Dict,
+                            specs: Dict,
+                            loop_level: int,
+                            fuse_processing: bool = False) -> Dict:
+    """Runs one iteration of a parallel loop in a worker process.
+    The iteration has its own Core and only sees the data passed to it.
+
+    :param modules: dict of all loaded elements, see XML_handler.loaded_modules
+    :param plan: PipelinePlan the modules were loaded from, or None
+    :param data: dict of module names to Data objects the loop depends on
+    :param specs: dict of the loop
+    :param loop_level: int, indentation of printed messages
+    :param fuse_processing [optional]: bool, see Core
+    :returns: dict of names of modules in the loop to their output Data
+    """
+    import random
+    import numpy as np
+    # Forked workers inherit the random state, reseed so iterations differ
+    np.random.seed(None)
+    random.seed()
+    core = Core(headless=True, fuse_processing=fuse_processing)
+    core._parallel_loops = False
+    core._xml_handler.loaded_modules = modules
+    if plan is not None:
+        core.plan = plan
+        core._module_plugins = PlanPlugins(plan, core._avail_plugins)
+    core._initialised = True
+    core.data.update(data)
+    core.loop_level = loop_level
+    core._init_status(specs)
+    core._execute(specs)
+    return {name: core.data[name] for name in core._loop_modules(specs)}
 
 
 class Core:
-    def __init__(self) -> None:
+    def __init__(self,
+                 headless: bool = False,
+                 max_workers: int = 1,
+                 fuse_processing: bool = False) -> None:
+        """
+        :param headless [optional]: bool, if True the pipeline is executed
+                        without launching the progress tracker between modules
+        :param max_workers [optional]: int, number of threads used to run
+                        independent modules concurrently. Headless only.
+        :param fuse_processing [optional]: bool, run chains of DataProcessing
+                        modules which fit and transform X as a single pass,
+                        which also transforms X_test
+        """
         self.data = {}
         self.data['Initialiser'] = Data()
         self._xml_handler = XML_handler()
-        self._avail_plugins: PluginSpecsInterface = PluginSpecs()
+        self._avail_plugins: PluginSpecsInterface = PluginSpecs.shared()
+        # Plugin specs given to modules, resolved by the plan if there is one
+        self._module_plugins: PluginSpecsInterface = self._avail_plugins
         
-        self.loop_level: int = 0
+        # Loops run concurrently in different threads, each tracks its own nesting
+        self._local = threading.local()
+        self.loop_level = 0
         self._initialised: bool = False
         self.status_logger:Dict = {}
         self._debug = False
+        self._headless = headless
+        self._max_workers = max_workers
+        self._result_cache: Union["ResultCache", None] = None
+        self.events = EventStream()
+        self._start_times: Dict[str, float] = {}
+        self._tracker = None
+        self._parallel_loops = True
+        self.instrumentation: Union[Instrumentation, None] = None
+        self.plan: Union[PipelinePlan, None] = None
+        self._fuse_processing = fuse_processing
+        self._chains: Dict[str, List[Dict]] = {}
+        self._fused_into: Dict[str, str] = {}
+
+    @property
+    def loop_level(self) -> int:
+        """Nesting level of loops in the current thread"""
+        return getattr(self._local, "loop_level", 0)
+
+    @loop_level.setter
+    def loop_level(self, value: int) -> None:
+        self._local.loop_level = value
+
+    def reset(self) -> None:
+        """Clears the loaded config file, data and status so another pipeline
+        can be run with this Core. The plugin registry, result cache, event
+        subscribers and instrumentation are kept. A running progress tracker
+        is closed.
+        """
+        self.data = {}
+        self.data['Initialiser'] = Data()
+        self._xml_handler = XML_handler()
+        self.plan = None
+        self._module_plugins = self._avail_plugins
+        self._chains = {}
+        self._fused_into = {}
+        self.loop_level = 0
+        self._initialised = False
+        self.status_logger = {}
+        self._start_times = {}
+        if self._tracker is not None:
+            self.events.unsubscribe(self._tracker)
+            self._tracker.close()
+            self._tracker = None
 
     def _launch(self):
+        from vai_lab.GUI.GUI_core import GUI
         gui_app = GUI()
         gui_app._debug = self._debug
         gui_app.set_avail_plugins(self._avail_plugins)
@@ -36,15 +142,49 @@ class Core:
             except:
                 raise Exception("No XML File Selected. Cannot Run Pipeline")
 
+    def enable_result_cache(self, cache_dir: str, max_size: int = 2**30) -> None:
+        """Reuse outputs of Modelling and DataProcessing modules across runs.
+        A module is skipped if its plugin, options, methods and input data
+        are unchanged since a cached run.
+
+        :param cache_dir: str, directory in which outputs are stored
+        :param max_size [optional]: int, cache size in bytes before LRU eviction
+        """
+        from vai_lab.Data.result_cache import ResultCache
+        self._result_cache = ResultCache(rel_to_abs(cache_dir), max_size)
+
+    def enable_instrumentation(self, trace_memory: bool = False) -> Instrumentation:
+        """Records duration, memory and data sizes of modules, data loading
+        and plugin methods in all following runs, see Core.instrumentation
+
+        :param trace_memory [optional]: bool, measure allocations with tracemalloc
+        :returns: Instrumentation, which can export the records as JSON or Chrome trace
+        """
+        self.instrumentation = Instrumentation(trace_memory)
+        return self.instrumentation
+
     def load_config_file(self, filename: Union[str,List,Tuple]):
         """Loads XML file into XML_handler object.
-        Parses filename first, if needed.
+        The first config is loaded from its compiled plan, which is cached
+        until the file changes. Further configs are merged into it.
         """
         if type(filename) == list or type(filename) == tuple:
             filedir:str = join(*filename)
         else:
             filedir = str(filename)
-        self._xml_handler.load_XML(filedir)
+        if not self._initialised:
+            self.plan = load_plan(filedir)
+            self._xml_handler.filename = self.plan.filename
+            self._xml_handler.loaded_modules = self.plan.copy_modules()
+            self._module_plugins = PlanPlugins(self.plan, self._avail_plugins)
+        else:
+            if not hasattr(self._xml_handler, "tree"):
+                # Re-parse the first config to merge the trees
+                self._xml_handler.loaded_modules = {}
+                self._xml_handler.load_XML(self.plan.filename)
+            self.plan = None
+            self._module_plugins = self._avail_plugins
+            self._xml_handler.load_XML(filedir)
         self._initialised = True
 
     def _load_data(self, specs, module = 'Initialiser') -> None:
@@ -55,19 +195,102 @@ class Core:
         if isinstance(init_data_fn, str):
             self.data[module].import_existing_data(init_data_fn, self.data)
         elif isinstance(init_data_fn, dict):
-            self.data[module].import_data_from_config(init_data_fn)
+            load_options = self._xml_handler.data_load_options(modules=specs, module=module)
+            with span("load_data: {0}".format(module), "data") as record:
+                self.data[module].import_data_from_config(init_data_fn, load_options)
+                if record is not None:
+                    record["args"]["output_size"] = data_nbytes(self.data[module])
 
     def _execute_module(self, specs):
+        """Executes named module, recorded as a span if instrumentation is enabled
+
+        :param specs: dict of module to be executed
+        """
+        if specs["name"] in self._fused_into:
+            print("\t"*self.loop_level
+                    + specs["module_type"]
+                    + " module: \"{}\" ".format(specs["name"])
+                    + "fused into \"{}\"".format(self._fused_into[specs["name"]])
+                  )
+            return
+        with span(specs["name"], "module", module_type=specs["module_type"],
+                  plugin=specs.get("plugin", {}).get("plugin_name")) as record:
+            if specs["name"] in self._chains:
+                self._run_processing_chain(self._chains[specs["name"]], record)
+            else:
+                self._run_module(specs, record)
+            if record is not None:
+                record["args"]["output_size"] = data_nbytes(self.data[specs["name"]])
+
+    def _find_processing_chains(self, specs):
+        """Registers the chains of DataProcessing modules among the elements of specs.
+        The first module of a chain runs all of them, the others are skipped
+        """
+        from vai_lab.DataProcessing.processing_chain import find_chains
+        for chain in find_chains(specs, self._xml_handler.loaded_modules):
+            self._chains[chain[0]["name"]] = chain
+            for module in chain[1:]:
+                self._fused_into[module["name"]] = chain[0]["name"]
+
+    def _run_processing_chain(self, chain, record=None):
+        """Executes a chain of DataProcessing modules in one pass.
+        All modules of the chain share its output Data
+
+        :param chain: list of dicts of the modules, in execution order
+        :param record [optional]: dict, instrumentation span of the first module
+        """
+        from vai_lab.DataProcessing.processing_chain import ProcessingChain
+        head = chain[0]["name"]
+        self._load_data(chain[0], head)
+        if record is not None:
+            record["args"]["input_size"] = data_nbytes(self.data[head])
+            record["args"]["fused"] = [module["name"] for module in chain]
+        mod = ProcessingChain()
+        mod.set_avail_plugins(self._module_plugins)
+        mod.set_options(deepcopy(chain))
+        mod._load_plugin(self.data[head])
+        print("\t"*self.loop_level
+                + chain[0]["module_type"]
+                + " modules: {} ".format(", ".join("\"{}\"".format(m["name"]) for m in chain))
+                + "processing in one pass..."
+              )
+        mod.launch()
+        for module in chain:
+            self.data[module["name"]] = mod.get_result()
+
+    def _run_module(self, specs, record=None):
         """Executes named module with given options
         Imports, instantiates, sets params, then launches module
 
         :param specs: dict of module to be executed
+        :param record [optional]: dict, instrumentation span of the module
         """
+        self._load_data(specs, specs["name"])
+        if record is not None:
+            record["args"]["input_size"] = data_nbytes(self.data[specs["name"]])
+        cache_key = None
+        # Iterations of a loop run the same module on the same input, e.g. with
+        # different random states, so the cache is not used inside loops
+        if self._result_cache is not None and self.loop_level == 0 \
+                and self._result_cache.is_cacheable(specs):
+            cache_key = self._result_cache.key(specs, self.data[specs["name"]])
+            cached = self._result_cache.load(cache_key)
+            if cached is not None:
+                print("\t"*self.loop_level
+                        + specs["module_type"]
+                        + " module: \"{}\" ".format(specs["name"])
+                        + "loaded from cache"
+                      )
+                self.data[specs["name"]] = cached
+                if record is not None:
+                    record["args"]["cached"] = True
+                return
+
         mod: ModuleInterface = import_module(globals(), specs["module_type"]).__call__()
         mod._debug = self._debug
-        mod.set_avail_plugins(self._avail_plugins)
-        self._load_data(specs, specs["name"])
-        mod.set_options(specs)
+        mod.set_avail_plugins(self._module_plugins)
+        # Plugins parse their options in-place, keep the loaded tree clean
+        mod.set_options(deepcopy(specs))
         if specs["name"] == 'User Interaction':
             mod.set_data_in(self.data[specs["name"]])
         else:
@@ -84,6 +307,9 @@ class Core:
         else:
             self.data[specs["name"]].import_existing_data(specs["name"], self.data)
 
+        if cache_key is not None:
+            self._result_cache.store(cache_key, self.data[specs["name"]])
+
     def _execute_loop(self, specs):
         if  hasattr(self,"_execute_{}_loop".format(specs["type"])):
             print("\t"*self.loop_level
@@ -124,21 +350,139 @@ class Core:
                 return range(0, condition)
         except:
             print("Condition \"{0}\" cannot be parsed".format(condition))
-            print(
-                "Other formats in development. Only ranged for loops are working currently")
+            print("For loops take a number of iterations. "
+                  + "Use a while or until loop for other conditions")
 
     def _execute_for_loop(self, specs):
         condition = self._parse_loop_condition(specs["condition"])
+        if specs.get("parallel", False):
+            if self._headless and self._parallel_loops:
+                return self._execute_parallel_loop(specs, condition)
+            print("\t"*self.loop_level
+                    + "Parallel loops are only available in headless mode. "
+                    + "Running sequentially.")
         for c in condition:
             self._execute(specs)
 
-    def _show_updated_tracker(self):
-        self.gui_app = GUI()
-        self.gui_app._debug = self._debug
-        self.gui_app.set_avail_plugins(self._avail_plugins)
-        self.gui_app.set_gui_as_progress_tracker(self.status_logger)
-        self.gui_app._append_to_output("xml_filename", self._xml_handler.filename)
-        return self.gui_app.launch()
+    def _execute_while_loop(self, specs):
+        self._execute_conditional_loop(specs, until=False)
+
+    def _execute_until_loop(self, specs):
+        self._execute_conditional_loop(specs, until=True)
+
+    def _execute_conditional_loop(self, specs, until: bool):
+        """Repeats a loop while (or until) its condition holds.
+        The condition is checked after each iteration against the data of the
+        pipeline, see vai_lab.Core.loop_condition. The loop also stops after
+        max_iter iterations (default 100) or once time_budget seconds have passed.
+        The number of iterations and the elapsed time are stored under the loop name.
+
+        :param specs: dict of the loop
+        :param until: bool, stop when the condition is True instead of False
+        """
+        try:
+            condition = LoopCondition(specs["condition"], self.data)
+        except LoopConditionError as exc:
+            print("\nError: Invalid Loop Condition.")
+            print(exc.msg)
+            raise
+        max_iter = specs.get("max_iter", 100)
+        time_budget = specs.get("time_budget")
+        start = time.perf_counter()
+        iteration = 0
+        while True:
+            self._execute(specs)
+            iteration += 1
+            elapsed = time.perf_counter() - start
+            if condition.evaluate(iteration, elapsed) == until:
+                reason = "condition met"
+                break
+            if iteration >= max_iter:
+                reason = "max_iter reached"
+                break
+            if time_budget is not None and elapsed >= time_budget:
+                reason = "time_budget reached"
+                break
+        print("\t"*(self.loop_level - 1)
+                + "Loop \"{0}\" stopped after {1} iterations: {2}"
+                  .format(specs["name"], iteration, reason))
+        self.data[specs["name"]] = Data()
+        self.data[specs["name"]].append_data_column("iterations", iteration)
+        self.data[specs["name"]].append_data_column("elapsed", elapsed)
+
+    def _loop_modules(self, specs) -> List[str]:
+        """Names of all modules inside a loop, including nested loops"""
+        names = []
+        for val in specs.values():
+            if type(val) == dict and val.get("class") == "module":
+                names.append(val["name"])
+            elif type(val) == dict and val.get("class") == "loop":
+                names += self._loop_modules(val)
+        return names
+
+    def _execute_parallel_loop(self, specs, condition):
+        """Runs the iterations of a loop in separate worker processes.
+        Every iteration starts from the data available before the loop and
+        writes into its own namespace, so iterations cannot see each other.
+        Afterwards, each module in the loop holds the output of the last
+        iteration, as in sequential execution, and the loop itself holds
+        the list of outputs of all iterations for each module. Workers get
+        the loaded elements rather than the config file, so elements merged
+        from several configs are kept. Elements in the loop start before the
+        first iteration and finish after the last one.
+
+        :param specs: dict of the loop
+        :param condition: range of iterations
+        """
+        deps = self._element_dependencies(specs) | {"Initialiser"}
+        data = {key: self.data[key] for key in deps if key in self.data}
+        workers = specs.get("workers") or (self._max_workers if self._max_workers > 1 else None)
+        # Elements in the loop are reported as running until all iterations finished
+        elements = list(walk_elements(specs))
+        for element in elements:
+            self._progress_start(element)
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_execute_loop_iteration,
+                                   self._xml_handler.loaded_modules,
+                                   self.plan,
+                                   data,
+                                   specs,
+                                   self.loop_level,
+                                   self._fuse_processing)
+                       for _ in condition]
+            results = [future.result() for future in futures]
+
+        modules = self._loop_modules(specs)
+        self.data[specs["name"]] = Data()
+        for name in modules:
+            self.data[specs["name"]].append_data_column(name, [r[name] for r in results])
+            if len(results) > 0:
+                self.data[name] = results[-1][name]
+        for element in elements:
+            self._progress_finish(element)
+
+    def subscribe(self, callback) -> None:
+        """Calls callback with each progress event of the pipeline.
+        See vai_lab.Core.events for the fields of the events.
+
+        :param callback: function taking an event dict
+        """
+        self.events.subscribe(callback)
+
+    def _start_tracker(self):
+        """Launches the progress tracker in its own process.
+        The tracker follows the progress events and does not block execution.
+        """
+        from vai_lab.GUI.tracker_process import TrackerProcess
+        self._tracker = TrackerProcess(self._xml_handler.filename,
+                                       deepcopy(self.status_logger),
+                                       self._debug)
+        self._tracker.start()
+        self.subscribe(self._tracker)
+
+    def _stop_requested(self) -> bool:
+        return self._tracker is not None and self._tracker.terminate_requested()
     
     def _init_status(self, modules):
         for key in [key for key, val in modules.items() if type(val) == dict]:
@@ -151,14 +495,119 @@ class Core:
 
     def _progress_start(self, module):
         self._add_status(module, 'start', self._t)
+        self._start_times[module['name']] = time.perf_counter()
+        self.events.publish("start", name=module['name'], **{"class": module['class']})
 
     def _progress_finish(self, module):
+        duration = time.perf_counter() - self._start_times.pop(module['name'])
         self._add_status(module, 'finish', self._t)
+        self._add_status(module, 'duration', duration)
+        info = {"class": module['class'], "duration": duration}
+        if module['class'] == 'module' and module['name'] in self.data:
+            info["data_size"] = data_nbytes(self.data[module['name']])
+            self._add_status(module, 'data_size', info["data_size"])
+        self.events.publish("finish", name=module['name'], **info)
 
     @property
     def _t(self):
         return time.strftime('%H:%M:%S', time.localtime())
 
+    def _element_dependencies(self, element) -> Set[str]:
+        """Collects the names an element depends on: its parents, the modules
+        its input data is taken from and, for the Output, the data it stores.
+        Loops inherit the dependencies of all their nested elements.
+
+        :param element: dict of module, loop or entry/exit point
+        :returns deps: set of names of elements required before this one
+        """
+        deps = set(element.get("parents", []))
+        for val in element.values():
+            if type(val) == dict and "class" in val:
+                if val["class"] == "data":
+                    if isinstance(val["to_load"], str):
+                        deps.add(val["to_load"])
+                else:
+                    deps |= self._element_dependencies(val)
+        if element["class"] == "exit_point":
+            outdata = element["plugin"]["options"].get("outdata", [])
+            deps |= {outdata} if isinstance(outdata, str) else set(outdata)
+        return deps
+
+    def _element_keys(self, specs) -> List[str]:
+        """Keys of the elements of one level, in the order of the plan if there
+        is one, otherwise in the order of the config
+        """
+        keys = [key for key, val in specs.items() if type(val) == dict]
+        if self.plan is None:
+            return keys
+        position = {name: idx for idx, name in enumerate(self.plan.order)}
+        return sorted(keys, key=lambda key: position.get(specs[key]["name"], len(position)))
+
+    def _dependency_graph(self, specs) -> Dict[str, Set[str]]:
+        """Builds the dependency graph between the elements of one level.
+        Only dependencies on elements earlier in the execution order are kept,
+        so the data flow is the same as for sequential execution. Elements without
+        relationships conservatively depend on the previous element.
+        Dependencies on elements nested in a loop become dependencies on the loop.
+
+        :param specs: dict of elements to be executed
+        :returns graph: dict of element name to names of its dependencies
+        """
+        keys = self._element_keys(specs)
+        # Elements nested in a loop are provided by the loop of this level
+        top_level = {key: key for key in keys}
+        for key in keys:
+            if specs[key]["class"] == "loop":
+                for nested in walk_elements(specs[key]):
+                    top_level[nested["name"]] = key
+        graph: Dict[str, Set[str]] = {}
+        for idx, key in enumerate(keys):
+            if "parents" in specs[key] or idx == 0:
+                earlier = set(keys[:idx])
+                deps = {top_level[name] for name in self._element_dependencies(specs[key])
+                        if name in top_level}
+                graph[key] = (deps - {key}) & earlier
+            else:
+                graph[key] = {keys[idx - 1]}
+        return graph
+
+    def _execute_element(self, element):
+        self._progress_start(element)
+        getattr(self, "_execute_{}".format(element["class"]))(element)
+        self._progress_finish(element)
+
+    def _execute_element_at_level(self, element, loop_level: int):
+        """Runs an element in a worker thread at the loop level of the submitting thread"""
+        self.loop_level = loop_level
+        self._execute_element(element)
+
+    def _execute_concurrent(self, specs):
+        """Run elements as soon as all their dependencies have finished.
+        Independent elements run concurrently on a thread pool.
+
+        :param specs: dict of elements to be executed
+        """
+        graph = self._dependency_graph(specs)
+        pending = list(graph.keys())
+        done: Set[str] = set()
+        running: Dict = {}
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            while pending or running:
+                for key in [k for k in pending if graph[k] <= done]:
+                    pending.remove(key)
+                    running[pool.submit(self._execute_element_at_level,
+                                        specs[key],
+                                        self.loop_level)] = key
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done.add(running.pop(future))
+                    future.result()
+                if self._stop_requested():
+                    # Running elements are finished, no new ones are started
+                    wait(running)
+                    print('Pipeline terminated')
+                    exit()
+
     def _execute(self, specs):
         """Run elements within a given dictionary.
         Only iterates over dict values that are dicts themselves.
@@ -166,23 +615,22 @@ class Core:
 
         :param specs: dict of elements to be executed
         """
-        for key in [key for key, val in specs.items() if type(val) == dict]:
-            
-            self._progress_start(specs[key])
-            getattr(self, "_execute_{}".format(specs[key]["class"]))(specs[key])
-            self._progress_finish(specs[key])
+        if self._fuse_processing:
+            self._find_processing_chains(specs)
+        if self._max_workers > 1 and self._headless:
+            return self._execute_concurrent(specs)
 
-            if specs[key]["class"] == 'module':
-                _tracker = self._show_updated_tracker()
+        for key in self._element_keys(specs):
+            self._execute_element(specs[key])
 
-                if not _tracker['terminate']:
-                    self.load_config_file(self._xml_handler.filename)
-                else:
-                    print('Pipeline terminated')
-                    exit()
+            if self._stop_requested():
+                print('Pipeline terminated')
+                exit()
 
     def _initialise_with_gui(self):
         """Launches GUI when no XML file is specified"""
+        if self._headless:
+            raise Exception("No XML File Loaded. Cannot Run Pipeline in headless mode")
         print("Loading GUI")
         print("To load existing config, run core.load_config_file(<path_to_file>)")
         self._launch()
@@ -190,10 +638,18 @@ class Core:
     def run(self):
         if not self._initialised:
             self._initialise_with_gui()
+        if self._max_workers > 1 and not self._headless:
+            print("Concurrent execution is only available in headless mode. "
+                  + "Running sequentially.")
         print("Running pipeline...")
-        if len(self._xml_handler.loaded_modules) > 0:
-            self._load_data(self._xml_handler.loaded_modules)
-        
-        self._init_status(self._xml_handler.loaded_modules)
-        self._execute(self._xml_handler.loaded_modules)
+        with self.instrumentation.activate() if self.instrumentation else nullcontext():
+            if len(self._xml_handler.loaded_modules) > 0:
+                self._load_data(self._xml_handler.loaded_modules)
+
+            self._init_status(self._xml_handler.loaded_modules)
+            if not self._headless and self._tracker is None:
+                self._start_tracker()
+            self.events.publish("pipeline_start")
+            self._execute(self._xml_handler.loaded_modules)
+            self.events.publish("pipeline_finish")
         print("Pipeline Complete")
\ No newline at end of file
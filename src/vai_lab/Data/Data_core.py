@@ -8,40 +8,107 @@ if not __package__:
     root_mod = path.dirname(path.dirname(path.dirname(__file__)))
     sys.path.append(root_mod)
 
-from typing import Dict, KeysView, TypeVar
+import sys
+from typing import TYPE_CHECKING, Any, KeysView, MutableMapping, TypeVar
 
 from vai_lab._import_helper import get_lib_parent_dir
 from vai_lab.Data.xml_handler import XML_handler
 from vai_lab._import_helper import rel_to_abs
 
-import pandas as pd # type: ignore
-import numpy as np
+if TYPE_CHECKING:
+    import pandas as pd # type: ignore
 
 DataT = TypeVar("DataT",bound="Data")
+
+
+def is_sparse(obj: Any) -> bool:
+    """Checks if obj is a scipy.sparse matrix or array.
+    scipy is not imported if nothing has loaded it, then obj cannot be sparse
+    """
+    if "scipy.sparse" not in sys.modules:
+        return False
+    return sys.modules["scipy.sparse"].issparse(obj)
+
+
 class Data:
     
     def __init__(self: DataT) -> None:
         self._lib_base_path = get_lib_parent_dir()
         self._xml_parser = XML_handler()
-        self.data: Dict[str, pd.core.frame.DataFrame] = {}
+        self.data: MutableMapping[str, "pd.DataFrame"] = {}
 
     def _import_csv(self: DataT,
                     filename: str,
                     data_name: str,
-                    strip_whitespace: bool = True) -> None:
+                    strip_whitespace: bool = True,
+                    storage: str = "memory",
+                    chunksize: int = None,
+                    downcast: bool = False,
+                    categorical: float = 0,
+                    stream: bool = False) -> None:
         """import data directly into DataFrame
         :param filename: str, filename of csv file to be loaded
         :param data_name: str, name of dict key in which data will be stored
         :param strip_whitespace: bool, remove spaces from before & after header names
+        :param storage: str, "memory" parses the file into RAM,
+                        "mmap" converts it once into memory-mapped columns stored
+                        next to the file and maps them on later loads
+        :param chunksize: int, parse the file in chunks of this many rows
+        :param downcast: bool, store floats as float32 and integers in the smallest type
+        :param categorical: float, max ratio of unique values for a text column
+                        to be stored as category. 0 disables
+        :param stream: bool, store a re-iterable stream of chunks instead of
+                        a DataFrame, for plugins that train incrementally
         TODO: pandas has a lot of inbuilt read functions, including excel - implement
         """
-        self.data[data_name] = pd.read_csv(filename,
-                                           delimiter=',',
-                                           quotechar='|')
+        read_kwargs = {"delimiter": ',', "quotechar": '|'}
+        if storage == "mmap":
+            from vai_lab.Data.columnar_store import load_csv
+            self.data[data_name] = load_csv(filename,
+                                            strip_whitespace=strip_whitespace,
+                                            **read_kwargs)
+            return
+        if stream:
+            from vai_lab.Data.csv_stream import CSVChunkStream
+            self.data[data_name] = CSVChunkStream(filename,
+                                                  chunksize or 2**16,
+                                                  downcast,
+                                                  categorical,
+                                                  strip_whitespace,
+                                                  **read_kwargs)
+            return
+        if chunksize is not None:
+            from vai_lab.Data.csv_stream import read_csv_chunked
+            self.data[data_name] = read_csv_chunked(filename,
+                                                    chunksize,
+                                                    downcast,
+                                                    categorical,
+                                                    strip_whitespace,
+                                                    **read_kwargs)
+            return
+        import pandas as pd # type: ignore
+        self.data[data_name] = pd.read_csv(filename, **read_kwargs)
+        if downcast or categorical > 0:
+            from vai_lab.Data.csv_stream import optimise_dtypes
+            optimise_dtypes(self.data[data_name], downcast, categorical)
         if strip_whitespace:
             self.data[data_name].columns = [c.strip()
                                             for c in self.data[data_name].columns]
 
+    def _import_npz(self: DataT,
+                    filename: str,
+                    data_name: str) -> None:
+        """Loads a scipy.sparse matrix saved with scipy.sparse.save_npz.
+        The matrix is stored as it is, without converting it to a DataFrame
+        :param filename: str, filename of npz file to be loaded
+        :param data_name: str, name of dict key in which data will be stored
+        """
+        from scipy import sparse # type: ignore
+        self.data[data_name] = sparse.load_npz(filename)
+
+    def _image_key(self: DataT, filename: str) -> str:
+        return filename.split(path.sep)[-1].split(".")[0]
+
     def _import_png(self: DataT,
                     filename: str,
                     data_name: str) -> None:
@@ -51,27 +118,45 @@ class Data:
         :param data_name: str, name of dict key in which data will be stored
         """
         import cv2 # type: ignore
-        key = filename.split(path.sep)[-1].split(".")[0]
-        self.data[data_name][key] = cv2.imread(filename)
+        self.data[data_name][self._image_key(filename)] = cv2.imread(filename)
 
     def _import_dir(self: DataT,
                     folder_dir: str,
-                    data_name: str) -> None:
+                    data_name: str,
+                    workers: int = None,
+                    lazy: bool = False,
+                    cache_size: int = 256) -> None:
         """Explores folder, and imports all data items recursively
+        Images are decoded in parallel threads, or on first access if lazy.
         
         :param folder_dir: str, directory to be explored
         :param data_name: str, name of dict key in which data will be stored
                 data_name is "data" overwritten by folder name due to recursion
                 This will probably change for user-defined names
+        :param workers: int, number of threads decoding images, defaults to CPU count
+        :param lazy: bool, decode images only when they are accessed
+        :param cache_size: int, number of decoded images kept in memory if lazy
         """
         from glob import glob
         if folder_dir[-1] != path.sep:
             folder_dir += path.sep
         # data_name = folder_dir.split(path.sep)[-2]
-        files = np.sort(glob(folder_dir + "*"))
-        self.data[data_name] = {}
+        files = sorted(glob(folder_dir + "*"))
+        images = [f for f in files if self._get_ext(f) == "png"]
+        if lazy:
+            from vai_lab.Data.image_store import LazyImageDict
+            self.data[data_name] = LazyImageDict(
+                {self._image_key(f): f for f in images}, cache_size)
+        else:
+            import cv2 # type: ignore
+            from concurrent.futures import ThreadPoolExecutor
+            self.data[data_name] = {}
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for f, img in zip(images, pool.map(cv2.imread, images)):
+                    self.data[data_name][self._image_key(f)] = img
         for f in files:
-            self.import_data(f, data_name)
+            if f not in images:
+                self.import_data(f, data_name)
 
     def _get_ext(self: DataT, path_dir: str) -> str:
         """Extracts extension from path_dir, or check if is dir
@@ -85,20 +170,26 @@ class Data:
 
     def import_data(self: DataT,
                     filename: str,
-                    data_name: str = "data") -> None:
+                    data_name: str = "data",
+                    **options) -> None:
         """Import file directly into DataFrame
         Translates relative files to absolute before parsing - not ideal
         Filename to parsing method based on extension name.
         :param filename: str, filename of file to be loaded
         :param data_name: str, name of class variable data will be loaded to
+        :param options: keyword arguments passed to the parsing method
         """
         filename = rel_to_abs(filename)
         ext = self._get_ext(filename)
-        getattr(self, "_import_{0}".format(ext))(filename, data_name)
+        getattr(self, "_import_{0}".format(ext))(filename, data_name, **options)
 
-    def import_data_from_config(self: DataT, config: dict) -> None:
+    def import_data_from_config(self: DataT, config: dict, options: dict = {}) -> None:
+        """Import all files in config
+        :param config: dict of data names and their filenames
+        :param options [optional]: dict of data names and their parsing options
+        """
         for c in config.keys():
-            self.import_data(config[c], c)
+            self.import_data(config[c], c, **options.get(c, {}))
 
     def import_existing_data(self: DataT, config: dict, data: DataT) -> None:
         for item in data[config].keys():
@@ -119,13 +210,24 @@ class Data:
     def keys(self: DataT) -> KeysView:
         return self.data.keys()
 
-    def __getitem__(self: DataT, key: str) -> pd.core.frame.DataFrame:
+    def __getitem__(self: DataT, key: str) -> "pd.DataFrame":
         return self.data[key]
 
     def copy(self: DataT) -> DataT:
         from copy import deepcopy
         return deepcopy(self)
 
+    def derive(self: DataT) -> DataT:
+        """Returns a new Data which holds the same items as this one without copying them.
+        Only the dict of items is new: items set in the derived Data are stored
+        only there, and items set in this Data later are not seen by it.
+        Shared items should be replaced rather than modified in-place.
+        """
+        from copy import copy
+        derived = copy(self)
+        derived.data = dict(self.data)
+        return derived
+
 if __name__ == "__main__":
     d = Data()
     # d.load_data_settings("./examples/data_passing_test.xml")
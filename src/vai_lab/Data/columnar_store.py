@@ -0,0 +1,132 @@
+"""Memory-mapped columnar storage for tabular data files.
+
+A CSV file is converted once into one ``.npy`` file per column, stored in a
+``<filename>.columns`` folder next to the source. Later loads map the numeric
+columns from disk instead of parsing the CSV again. Columns of non-numeric
+type are stored as pickled object arrays and loaded into memory.
+The store is rebuilt when the size or modification time of the source changes.
+"""
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+_META_FILE = "meta.json"
+
+
+def store_dir(filename: str) -> str:
+    """Returns the folder holding the columnar store of filename"""
+    return filename + ".columns"
+
+
+def _source_signature(filename: str) -> Dict[str, int]:
+    st = os.stat(filename)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_meta(filename: str):
+    try:
+        with open(os.path.join(store_dir(filename), _META_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def is_current(filename: str) -> bool:
+    """Checks if a columnar store exists and matches the current source file"""
+    meta = _read_meta(filename)
+    return meta is not None and meta["source"] == _source_signature(filename)
+
+
+def _merge_dtype(current, new):
+    """Common dtype of a column over chunks. Non-numpy dtypes fall back to object"""
+    if not isinstance(new, np.dtype) or new.kind not in "biufc":
+        return np.dtype(object)
+    if current is None:
+        return new
+    return np.result_type(current, new)
+
+
+def convert_csv(filename: str,
+                strip_whitespace: bool = True,
+                chunksize: int = 2**18,
+                **read_kwargs) -> None:
+    """Converts a CSV file into a columnar store next to it.
+    The file is read twice in chunks: first to find the number of rows and the
+    dtype of each column, then to fill the preallocated column files.
+
+    :param filename: str, absolute path of csv file
+    :param strip_whitespace [optional]: bool, remove spaces around header names
+    :param chunksize [optional]: int, number of rows parsed at once
+    :param read_kwargs [optional]: passed on to pandas.read_csv
+    """
+    out_dir = store_dir(filename)
+    os.makedirs(out_dir, exist_ok=True)
+    meta_path = os.path.join(out_dir, _META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    n_rows = 0
+    columns: List[str] = []
+    dtypes: Dict[str, np.dtype] = {}
+    for chunk in pd.read_csv(filename, chunksize=chunksize, **read_kwargs):
+        if not columns:
+            columns = list(chunk.columns)
+        for c in columns:
+            dtypes[c] = _merge_dtype(dtypes.get(c), chunk[c].dtype)
+        n_rows += len(chunk)
+
+    files = {c: "col_{0}.npy".format(i) for i, c in enumerate(columns)}
+    mapped = {c: np.lib.format.open_memmap(os.path.join(out_dir, files[c]),
+                                           mode="w+",
+                                           dtype=dtypes[c],
+                                           shape=(n_rows,))
+              for c in columns if dtypes[c] != object}
+    objects: Dict[str, List] = {c: [] for c in columns if dtypes[c] == object}
+
+    start = 0
+    for chunk in pd.read_csv(filename, chunksize=chunksize, **read_kwargs):
+        stop = start + len(chunk)
+        for c in mapped:
+            mapped[c][start:stop] = chunk[c].to_numpy(dtype=dtypes[c])
+        for c in objects:
+            objects[c].extend(chunk[c].to_numpy(dtype=object))
+        start = stop
+
+    for c in mapped:
+        mapped[c].flush()
+    for c in objects:
+        np.save(os.path.join(out_dir, files[c]),
+                np.array(objects[c], dtype=object),
+                allow_pickle=True)
+
+    names = [c.strip() if strip_whitespace else c for c in columns]
+    meta = {"source": _source_signature(filename),
+            "columns": [{"name": n, "file": files[c], "mmap": c in mapped}
+                        for n, c in zip(names, columns)]}
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+def load_csv(filename: str, **convert_kwargs) -> pd.DataFrame:
+    """Returns a DataFrame backed by the memory-mapped columns of filename.
+    Converts the file first if no current store exists.
+
+    :param filename: str, absolute path of csv file
+    :param convert_kwargs [optional]: passed on to convert_csv
+    """
+    if not is_current(filename):
+        convert_csv(filename, **convert_kwargs)
+    meta = _read_meta(filename)
+    out_dir = store_dir(filename)
+    columns = {}
+    for col in meta["columns"]:
+        col_path = os.path.join(out_dir, col["file"])
+        if col["mmap"]:
+            columns[col["name"]] = np.load(col_path, mmap_mode="r")
+        else:
+            columns[col["name"]] = np.load(col_path, allow_pickle=True)
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,116 @@
+"""Chunked CSV ingestion with dtype downcasting and categorical encoding."""
+import os
+from typing import Dict, Iterator, List
+
+import pandas as pd  # type: ignore
+from pandas.api.types import union_categoricals  # type: ignore
+
+
+def optimise_dtypes(df: pd.DataFrame,
+                    downcast: bool = True,
+                    categorical: float = 0) -> pd.DataFrame:
+    """Reduces the memory of a DataFrame in-place.
+    Floats are downcast to float32 and integers to the smallest integer type
+    holding their values. Text columns are converted to categories if their
+    ratio of unique values is at most `categorical`.
+
+    :param df: DataFrame to be converted
+    :param downcast [optional]: bool, downcast numeric columns
+    :param categorical [optional]: float in [0, 1], max ratio of unique values
+                        of a text column to be stored as category. 0 disables
+    :returns df: converted DataFrame
+    """
+    for c in df.columns:
+        col = df[c]
+        if downcast and pd.api.types.is_float_dtype(col):
+            df[c] = pd.to_numeric(col, downcast="float")
+        elif downcast and pd.api.types.is_integer_dtype(col):
+            df[c] = pd.to_numeric(col, downcast="integer")
+        elif categorical > 0 \
+                and (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)) \
+                and col.nunique() <= categorical * len(col):
+            df[c] = col.astype("category")
+    return df
+
+
+def _strip_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def _concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates chunks column by column.
+    Categories are merged so that categorical columns stay categorical.
+    """
+    out: Dict[str, pd.Series] = {}
+    for c in chunks[0].columns:
+        parts = [chunk[c] for chunk in chunks]
+        if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+            out[c] = pd.Series(union_categoricals(parts), name=c)
+        else:
+            parts = [p.astype(object) if isinstance(p.dtype, pd.CategoricalDtype) else p
+                     for p in parts]
+            out[c] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(out)
+
+
+def read_csv_chunked(filename: str,
+                     chunksize: int,
+                     downcast: bool = True,
+                     categorical: float = 0,
+                     strip_whitespace: bool = True,
+                     **read_kwargs) -> pd.DataFrame:
+    """Reads a CSV file in chunks, reducing the memory of each chunk before
+    the next one is parsed, so peak memory stays close to the final size.
+
+    :param filename: str, filename of csv file to be loaded
+    :param chunksize: int, number of rows parsed at once
+    :param downcast [optional]: bool, see optimise_dtypes
+    :param categorical [optional]: float, see optimise_dtypes
+    :param strip_whitespace [optional]: bool, remove spaces around header names
+    :param read_kwargs [optional]: passed on to pandas.read_csv
+    """
+    chunks = [optimise_dtypes(chunk, downcast, categorical)
+              for chunk in pd.read_csv(filename, chunksize=chunksize, **read_kwargs)]
+    if len(chunks) == 0:
+        df = pd.read_csv(filename, **read_kwargs)
+    else:
+        df = _concat_chunks(chunks)
+    return _strip_columns(df) if strip_whitespace else df
+
+
+class CSVChunkStream:
+    """Re-iterable stream of DataFrame chunks of a CSV file.
+    The file is parsed lazily on each iteration and is never held in memory
+    as a whole. Used by plugins that support incremental training.
+    """
+
+    def __init__(self,
+                 filename: str,
+                 chunksize: int,
+                 downcast: bool = True,
+                 categorical: float = 0,
+                 strip_whitespace: bool = True,
+                 **read_kwargs) -> None:
+        """
+        :param filename: str, filename of csv file to be streamed
+        :param chunksize: int, number of rows per chunk
+        See read_csv_chunked for the other parameters
+        """
+        self.filename = filename
+        self.chunksize = chunksize
+        self.downcast = downcast
+        self.categorical = categorical
+        self.strip_whitespace = strip_whitespace
+        self.read_kwargs = read_kwargs
+        # Identifies the file version, e.g. for result cache fingerprints
+        st = os.stat(filename)
+        self.source = (st.st_size, st.st_mtime_ns)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for chunk in pd.read_csv(self.filename, chunksize=self.chunksize, **self.read_kwargs):
+            chunk = optimise_dtypes(chunk, self.downcast, self.categorical)
+            yield _strip_columns(chunk) if self.strip_whitespace else chunk
+
+    def __repr__(self) -> str:
+        return "CSVChunkStream({0}, chunksize={1})".format(self.filename, self.chunksize)
@@ -0,0 +1,78 @@
+"""Lazily decoded collection of image files."""
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from threading import Lock
+from typing import Any, Dict, Iterator
+
+
+class LazyImageDict(MutableMapping):
+    """Dict-like container of images which are decoded on first access.
+    Keeps the most recently used decoded images in a bounded LRU cache,
+    so memory stays constant regardless of the number of files.
+    Items set explicitly are stored as given and never evicted.
+    """
+
+    def __init__(self, files: Dict[str, str], cache_size: int = 256) -> None:
+        """
+        :param files: dict of image names and their absolute filenames
+        :param cache_size [optional]: int, maximum number of decoded images kept in memory
+        """
+        self._files = dict(files)
+        self._items: Dict[str, Any] = {}
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def _decode(self, filename: str):
+        import cv2  # type: ignore
+        return cv2.imread(filename)
+
+    def __getitem__(self, key: str):
+        if key in self._items:
+            return self._items[key]
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        img = self._decode(self._files[key])
+        with self._lock:
+            self._cache[key] = img
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return img
+
+    def __setitem__(self, key: str, value) -> None:
+        self._files.pop(key, None)
+        with self._lock:
+            self._cache.pop(key, None)
+        self._items[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._items:
+            del self._items[key]
+        else:
+            del self._files[key]
+            with self._lock:
+                self._cache.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._files
+        yield from self._items
+
+    def __len__(self) -> int:
+        return len(self._files) + len(self._items)
+
+    def filename(self, key: str) -> str:
+        """Returns the file an image is decoded from"""
+        return self._files[key]
+
+    def __getstate__(self) -> Dict:
+        """Decoded images are not pickled, only the filenames"""
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
@@ -0,0 +1,243 @@
+"""Execution plans compiled from XML pipeline configs.
+
+A plan holds the parsed modules of a config, as XML_handler.loaded_modules,
+with absolute data paths, the plugin each module resolves to and an order
+of all elements which respects their parents. Plans are validated when they
+are compiled and cached on disk, keyed by the hash of the config file, so
+an unchanged config is not parsed again. Core runs the elements of a plan in
+its order and loads their plugins through PlanPlugins, without searching
+the plugin registry again.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional
+
+from vai_lab._import_helper import get_cache_dir, get_lib_parent_dir, rel_to_abs
+from vai_lab.Data.xml_handler import XML_handler
+
+_PLAN_VERSION = 2
+_MAX_CACHED_PLANS = 256
+_ELEMENT_CLASSES = ("module", "loop", "entry_point", "exit_point")
+
+
+class PipelinePlanError(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+class PipelinePlan:
+    """Validated plan of a pipeline. Attributes cannot be reassigned and
+    modules is a read-only mapping. Its elements are shared with the plan,
+    use copy_modules to obtain a tree which can be modified
+    """
+
+    def __init__(self,
+                 filename: str,
+                 file_hash: str,
+                 modules: Dict,
+                 plugins: Dict[str, Dict[str, str]],
+                 order: List[str]) -> None:
+        """
+        :param filename: str, absolute path of the XML config
+        :param file_hash: str, sha1 of the config file
+        :param modules: dict of parsed elements, see XML_handler.loaded_modules
+        :param plugins: dict of module names to the package and class name of their plugin
+        :param order: list of names of all elements, each after its parents
+        """
+        self.__dict__.update(filename=filename,
+                             file_hash=file_hash,
+                             _modules=modules,
+                             plugins=MappingProxyType(plugins),
+                             order=tuple(order))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PipelinePlan is immutable")
+
+    def __getstate__(self) -> Dict:
+        state = dict(self.__dict__)
+        state["plugins"] = dict(state["plugins"])
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        state["plugins"] = MappingProxyType(state["plugins"])
+        self.__dict__.update(state)
+
+    @property
+    def modules(self) -> Mapping:
+        """Read-only view of the parsed elements"""
+        return MappingProxyType(self._modules)
+
+    def copy_modules(self) -> Dict:
+        """Parsed elements as a new tree, see XML_handler.loaded_modules"""
+        from copy import deepcopy
+        return deepcopy(self._modules)
+
+    def data_paths(self) -> List[str]:
+        """Absolute paths of all data files and folders loaded by the pipeline"""
+        return [p for el in walk_elements(self._modules)
+                for data in _data_specs(el)
+                if isinstance(data["to_load"], dict)
+                for p in data["to_load"].values()]
+
+
+class PlanPlugins:
+    """Plugin specs of a plan. Plugins of the modules in the plan are looked up
+    from their resolution in the plan, everything else from the plugin registry
+    """
+
+    def __init__(self, plan: PipelinePlan, specs) -> None:
+        """
+        :param plan: PipelinePlan
+        :param specs: PluginSpecs, used for plugins and information not in the plan
+        """
+        self._specs = specs
+        self._resolved: Dict[str, Dict[str, str]] = {}
+        for el in walk_elements(plan.modules):
+            if el["name"] in plan.plugins:
+                plugin = plan.plugins[el["name"]]
+                self._resolved[el["plugin"]["plugin_name"]] = {
+                    "_PLUGIN_PACKAGE": plugin["package"],
+                    "_PLUGIN_CLASS_NAME": plugin["class_name"]}
+
+    def find_from_readable_name(self, value) -> Optional[Dict]:
+        if value in self._resolved:
+            return self._resolved[value]
+        return self._specs.find_from_readable_name(value)
+
+    def __getattr__(self, name):
+        return getattr(self._specs, name)
+
+
+def walk_elements(elements: Mapping) -> Iterator[Dict]:
+    """Yields all elements, including those nested in loops"""
+    for val in elements.values():
+        if isinstance(val, dict) and val.get("class") in _ELEMENT_CLASSES:
+            yield val
+            if val["class"] == "loop":
+                yield from walk_elements(val)
+
+
+def _data_specs(element: Dict) -> Iterator[Dict]:
+    for val in element.values():
+        if isinstance(val, dict) and val.get("class") == "data":
+            yield val
+
+
+def _topological_order(elements: Dict[str, Dict]) -> List[str]:
+    """Orders elements after their parents, otherwise as in the config"""
+    order: List[str] = []
+    done = set()
+    pending = list(elements)
+    while pending:
+        ready = [name for name in pending
+                 if set(elements[name].get("parents", [])) <= done | {name}]
+        if not ready:
+            raise PipelinePlanError(
+                "Pipeline elements have circular parents: {0}".format(", ".join(pending)))
+        for name in ready:
+            pending.remove(name)
+            done.add(name)
+            order.append(name)
+    return order
+
+
+def compile_plan(filename: str, file_hash: str = None) -> PipelinePlan:
+    """Parses and validates an XML config
+
+    :param filename: str, XML config file
+    :param file_hash [optional]: str, sha1 of the file, computed if not given
+    :returns: PipelinePlan
+    """
+    from vai_lab._plugin_helpers import PluginSpecs
+    handler = XML_handler()
+    handler.load_XML(filename)
+    if file_hash is None:
+        with open(handler.filename, "rb") as f:
+            file_hash = hashlib.sha1(f.read()).hexdigest()
+
+    elements = {el["name"]: el for el in walk_elements(handler.loaded_modules)}
+    specs = PluginSpecs.shared()
+    plugins = {}
+    for name, el in elements.items():
+        for parent in el.get("parents", []):
+            if parent not in elements:
+                raise PipelinePlanError(
+                    "Element \"{0}\" has unknown parent \"{1}\"".format(name, parent))
+        for data in _data_specs(el):
+            if isinstance(data["to_load"], dict):
+                data["to_load"] = {key: rel_to_abs(val) for key, val in data["to_load"].items()}
+            elif data["to_load"] not in elements:
+                raise PipelinePlanError(
+                    "Element \"{0}\" takes data from unknown module \"{1}\""
+                    .format(name, data["to_load"]))
+        if el["class"] == "module":
+            plugin_name = el.get("plugin", {}).get("plugin_name")
+            plugin = specs.find_from_readable_name(plugin_name) if plugin_name else None
+            if plugin is None:
+                raise PipelinePlanError(
+                    "Module \"{0}\": plugin \"{1}\" not found".format(name, plugin_name))
+            plugins[name] = {"package": plugin["_PLUGIN_PACKAGE"],
+                             "class_name": plugin["_PLUGIN_CLASS_NAME"]}
+
+    return PipelinePlan(handler.filename,
+                        file_hash,
+                        handler.loaded_modules,
+                        plugins,
+                        _topological_order(elements))
+
+
+def _plan_file(key: str) -> str:
+    return os.path.join(get_cache_dir(), "plans", "{0}.pkl".format(key))
+
+
+def _save_plan(key: str, plan: PipelinePlan) -> None:
+    filename = _plan_file(key)
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        # A unique temporary file, other processes may compile the same config at the same time
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, filename)
+        plans = sorted((os.path.join(os.path.dirname(filename), f)
+                        for f in os.listdir(os.path.dirname(filename)) if f.endswith(".pkl")),
+                       key=os.path.getmtime)
+        for old in plans[:-_MAX_CACHED_PLANS]:
+            os.remove(old)
+    except OSError:
+        # The cache is optional, e.g. if the home directory is read-only
+        pass
+
+
+def load_plan(filename: str, use_cache: bool = True) -> PipelinePlan:
+    """Returns the plan of an XML config, compiled or from the cache.
+    A cached plan is used if the config file is unchanged and all its data
+    files still exist.
+
+    :param filename: str, XML config file, relative paths as in XML_handler
+    :param use_cache [optional]: bool, read and write the plan cache
+    :returns: PipelinePlan
+    """
+    handler = XML_handler()
+    handler.set_filename(filename)
+    with open(handler.filename, "rb") as f:
+        file_hash = hashlib.sha1(f.read()).hexdigest()
+    if not use_cache:
+        return compile_plan(handler.filename, file_hash)
+
+    key = hashlib.sha1("{0}|{1}|{2}|{3}".format(_PLAN_VERSION, get_lib_parent_dir(),
+                                                handler.filename, file_hash)
+                       .encode()).hexdigest()
+    try:
+        with open(_plan_file(key), "rb") as f:
+            plan = pickle.load(f)
+        if all(os.path.exists(p) for p in plan.data_paths()):
+            return plan
+    except Exception:
+        pass
+    plan = compile_plan(handler.filename, file_hash)
+    _save_plan(key, plan)
+    return plan
@@ -0,0 +1,183 @@
+"""Content-addressed on-disk cache of module outputs.
+
+Entries are keyed on a hash of the module spec together with a fingerprint
+of the module input data, so a module whose plugin, options and input are
+unchanged since a previous run can be skipped. Modules with effects outside
+the pipeline data, i.e. saving to or loading from a model store, are never
+cached, as a hit would skip these effects.
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from vai_lab._types import DataInterface
+from vai_lab.Data.Data_core import is_sparse
+from vai_lab.Data.image_store import LazyImageDict
+
+# Plugin methods which read or write outside the pipeline data
+_UNCACHEABLE_METHODS = ("save", "load")
+
+
+def spec_hash(specs: dict) -> str:
+    """Hash of the parts of a module spec which define its output:
+    module type, plugin name, plugin options and methods (incl. their order)
+
+    :param specs: dict of module as parsed by XML_handler
+    :returns: str hex digest
+    """
+    plugin = specs.get("plugin", {})
+    relevant = {"module_type": specs.get("module_type"),
+                "plugin_name": plugin.get("plugin_name"),
+                "options": plugin.get("options", {}),
+                "methods": plugin.get("methods", {})}
+    encoded = json.dumps(relevant, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _update_fingerprint(h, obj: Any) -> None:
+    """Feeds obj into hash object h. Recurses through dicts, lists and tuples"""
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"DataFrame")
+        h.update(repr((list(obj.columns), list(obj.dtypes))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"Series")
+        h.update(repr((obj.name, obj.dtype)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, np.ndarray) and obj.dtype != object:
+        h.update(b"ndarray")
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(memoryview(np.ascontiguousarray(obj)).cast("B"))
+    elif is_sparse(obj):
+        # Hashed in canonical CSR form, so equal matrices match in any format
+        csr = obj.tocsr()
+        if not csr.has_canonical_format:
+            # Copy so the input is not modified in-place
+            csr = csr.copy()
+            csr.sum_duplicates()
+        h.update(b"sparse")
+        h.update(repr((csr.dtype.str, csr.shape)).encode())
+        for arr in (csr.data, csr.indices, csr.indptr):
+            h.update(memoryview(np.ascontiguousarray(arr)).cast("B"))
+    elif isinstance(obj, LazyImageDict):
+        # Images are identified by their file version, without decoding them
+        h.update(b"LazyImageDict")
+        for key in sorted(obj.keys(), key=repr):
+            h.update(repr(key).encode())
+            if key in obj._files:
+                st = os.stat(obj._files[key])
+                h.update(repr((obj._files[key], st.st_size, st.st_mtime_ns)).encode())
+            else:
+                _update_fingerprint(h, obj[key])
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for key in sorted(obj.keys(), key=repr):
+            h.update(repr(key).encode())
+            _update_fingerprint(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for item in obj:
+            _update_fingerprint(h, item)
+    elif obj is None or isinstance(obj, (str, int, float, bool)):
+        h.update(repr(obj).encode())
+    else:
+        h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def data_fingerprint(data: DataInterface) -> str:
+    """Hash of the contents of all items in a Data object
+
+    :param data: vai_lab.Data.Data_core.Data
+    :returns: str hex digest
+    """
+    h = hashlib.sha256()
+    for key in sorted(data.keys()):
+        h.update(repr(key).encode())
+        _update_fingerprint(h, data[key])
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of module output Data objects stored on disk"""
+
+    def __init__(self,
+                 cache_dir: str,
+                 max_size: int = 2**30,
+                 module_types: Tuple[str, ...] = ("Modelling", "DataProcessing")):
+        """
+        :param cache_dir: str, directory in which cached outputs are stored
+        :param max_size [optional]: int, maximum total size of cache in bytes
+        :param module_types [optional]: tuple of module types whose outputs are cached
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.module_types = module_types
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def is_cacheable(self, specs: dict) -> bool:
+        """Modules of module_types are cached unless their plugin saves or loads models"""
+        methods = specs.get("plugin", {}).get("methods", {}).get("_order", [])
+        return specs.get("module_type") in self.module_types \
+            and not any(m in _UNCACHEABLE_METHODS for m in methods)
+
+    def key(self, specs: dict, data_in: DataInterface) -> str:
+        """Combines module spec hash and input data fingerprint into cache key"""
+        h = hashlib.sha256()
+        h.update(spec_hash(specs).encode())
+        h.update(data_fingerprint(data_in).encode())
+        return h.hexdigest()
+
+    def load(self, key: str) -> Optional[DataInterface]:
+        """Returns cached output for key, or None on a miss.
+        Hits are marked as recently used.
+        """
+        filename = self._path(key)
+        try:
+            with open(filename, "rb") as handle:
+                data = pickle.load(handle)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(filename)
+        return data
+
+    def store(self, key: str, data: DataInterface) -> None:
+        """Writes output for key, then evicts least recently used entries"""
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until cache fits in max_size"""
+        entries = []
+        for f in os.listdir(self.cache_dir):
+            if f.endswith(".pkl"):
+                try:
+                    st = os.stat(os.path.join(self.cache_dir, f))
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, f))
+        total = sum(e[1] for e in entries)
+        for _, size, f in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, f))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for f in os.listdir(self.cache_dir):
+            if f.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, f))
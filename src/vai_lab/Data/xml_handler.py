@@ -231,7 +231,8 @@ class XML_handler:
                      if "name" in element.attrib else "input_data")
         parent[data_name] = {"name": data_name,
                              "class": "data",
-                             "to_load": {}}
+                             "to_load": {},
+                             "load_options": {}}
         for child in element:
             assert "file" in child.attrib or "folder" in child.attrib or "module" in child.attrib,\
                 str("XML Parse Error \
@@ -256,6 +257,12 @@ class XML_handler:
             if "module" in child.attrib:
                 parent[data_name]["to_load"] = child.attrib["module"]          
 
+            load_options = {key: self._str_to_value(val)
+                            for key, val in child.attrib.items()
+                            if key not in ("file", "folder", "module")}
+            if len(load_options) > 0:
+                parent[data_name]["load_options"][child.tag] = load_options
+
     def _load_exit_point(self, element: ET.Element, parent: dict) -> None:
         """Parses tags associated with output and appends to parent dict
         :param elem: xml.etree.ElementTree.Element to be parsed
@@ -277,6 +284,9 @@ class XML_handler:
             "type": element.attrib["type"].lower(),
             "condition": element.attrib["condition"],
         }
+        for attr in ("parallel", "workers", "max_iter", "time_budget"):
+            if attr in element.attrib:
+                parent[loop_name][attr] = self._str_to_value(element.attrib[attr])
         self._parse_tags(element, parent[loop_name])
 
     def _load_relationships(self, element: ET.Element, parent: dict) -> None:
@@ -319,6 +329,19 @@ class XML_handler:
         except ValueError:
             return string
 
+    def _str_to_value(self, string: str) -> Union[str, int, float, bool]:
+        """Converts a string to bool, int or float if possible
+            Otherwise returns string
+
+        :param string: The string to be converted if possible
+        :returns out: either a string, bool, float or int
+        """
+        if string.strip().lower() in ("true", "yes"):
+            return True
+        elif string.strip().lower() in ("false", "no"):
+            return False
+        return self._str_to_num(string.strip())
+
     def _parse_text_to_list(self, element: ET.Element) -> List:
         """Formats raw text data
         :param elem: xml.etree.ElementTree.Element to be parsed
@@ -746,6 +769,14 @@ class XML_handler:
             modules = self.loaded_modules
         return self._get_data_structure(modules, module)["to_load"]
 
+    def data_load_options(self, modules=False, module='Initialiser') -> Dict[str, Dict]:
+        """Returns the parsing options of each data file, set as extra
+        attributes of the inputdata tags (e.g. <X file="..." storage="mmap"/>)
+        """
+        if not modules:
+            modules = self.loaded_modules
+        return self._get_data_structure(modules, module).get("load_options", {})
+
 
 # Use case examples:
 if __name__ == "__main__":
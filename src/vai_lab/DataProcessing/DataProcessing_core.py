@@ -1,7 +1,8 @@
 from vai_lab._import_helper import import_plugin_absolute
 from vai_lab._types import PluginSpecsInterface, DataInterface, DataProcessingPluginInterface
+from vai_lab.Data.Data_core import is_sparse
 from pandas import DataFrame
-from numpy import array
+from numpy import ndarray
 class DataProcessing(object):
     def __init__(self) -> None:
         self.output_data: DataInterface
@@ -36,8 +37,8 @@ class DataProcessing(object):
             else:
                 out = getattr(self._plugin, "{}".format(method))()
 
-        self.output_data = self._data_in.copy()
-        if len(out) > 0 and (isinstance(out[0], DataFrame) or isinstance(out[0], array)):
+        self.output_data = self._data_in.derive()
+        if len(out) > 0 and (isinstance(out[0], (DataFrame, ndarray)) or is_sparse(out[0])):
             self.output_data.data[list(out[1])[0]] = out[0]
 
     def get_result(self) -> DataInterface:
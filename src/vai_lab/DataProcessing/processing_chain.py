@@ -0,0 +1,127 @@
+"""Fusion of consecutive DataProcessing modules into a single transform pass.
+
+A chain is a sequence of DataProcessing modules at the same level of the
+pipeline, each taking its data only from the previous one, which nothing
+else refers to. Every module of a chain must fit and transform X only.
+The chain fits each plugin on the numpy array transformed by the plugins
+before it, without intermediate DataFrames or Data copies, and applies the
+fitted chain to X_test as well. Sparse matrices are passed through as they are.
+"""
+from typing import Dict, List, Set
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from vai_lab._types import DataInterface, PluginSpecsInterface
+from vai_lab.Data.Data_core import is_sparse
+from vai_lab.Data.pipeline_plan import walk_elements
+from vai_lab.DataProcessing.DataProcessing_core import DataProcessing
+
+
+def _data_source(element: Dict):
+    for val in element.values():
+        if isinstance(val, dict) and val.get("class") == "data":
+            return val["to_load"]
+    return None
+
+
+def _references(pipeline: Dict) -> Dict[str, Set[str]]:
+    """Names of the elements referring to each element as parent, data
+    source or output data
+    """
+    refs: Dict[str, Set[str]] = {}
+    for el in walk_elements(pipeline):
+        names = set(el.get("parents", []))
+        source = _data_source(el)
+        if isinstance(source, str):
+            names.add(source)
+        outdata = el.get("plugin", {}).get("options", {}).get("outdata", []) \
+            if el["class"] == "exit_point" else []
+        names.update([outdata] if isinstance(outdata, str) else outdata)
+        for name in names:
+            refs.setdefault(name, set()).add(el["name"])
+    return refs
+
+
+def fusable(element: Dict) -> bool:
+    """Checks if a module only fits and transforms X"""
+    if element.get("module_type") != "DataProcessing":
+        return False
+    methods = element["plugin"]["methods"]
+    return methods["_order"] == ["fit", "transform"] \
+        and all(methods[m].get("options") == {"X": "X"} for m in ("fit", "transform"))
+
+
+def find_chains(specs: Dict, pipeline: Dict) -> List[List[Dict]]:
+    """Finds chains of at least two fusable modules among the elements of specs
+
+    :param specs: dict of elements run together, e.g. a loop
+    :param pipeline: dict of all elements, to find other references to a module
+    :returns: list of chains, each a list of module specs in execution order
+    """
+    refs = _references(pipeline)
+    modules = {key: val for key, val in specs.items()
+               if isinstance(val, dict) and val.get("class") == "module" and fusable(val)}
+    following = {}
+    for name, el in modules.items():
+        source = _data_source(el)
+        if source in modules and refs.get(source) == {name} \
+                and set(el.get("parents", [])) <= {source}:
+            following[source] = name
+    chains = []
+    for head in [name for name in following if name not in following.values()]:
+        chain = [head]
+        while chain[-1] in following:
+            chain.append(following[chain[-1]])
+        chains.append([modules[name] for name in chain])
+    return chains
+
+
+class ProcessingChain:
+    def __init__(self) -> None:
+        self.output_data: DataInterface
+
+    def set_avail_plugins(self, avail_plugins: PluginSpecsInterface) -> None:
+        self._avail_plugins = avail_plugins
+
+    def set_options(self, chain: List[Dict]) -> None:
+        """:param chain: list of module configs, as returned by find_chains"""
+        self._chain = chain
+
+    def _load_plugin(self, data_in: DataInterface) -> None:
+        """Loads the plugins of all modules. They are configured with the
+        input data of the chain, which only provides their options
+        """
+        self._data_in = data_in
+        self._plugins = []
+        for config in self._chain:
+            mod = DataProcessing()
+            mod.set_avail_plugins(self._avail_plugins)
+            mod.set_options(config)
+            mod._load_plugin(data_in)
+            self._plugins.append(mod._plugin)
+
+    def _to_array(self, data):
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            return data.to_numpy()
+        return data if is_sparse(data) else np.asarray(data)
+
+    def _as_data(self, data):
+        return data if is_sparse(data) else pd.DataFrame(data)
+
+    def launch(self) -> None:
+        """Fits and transforms X with each plugin in turn, then transforms X_test"""
+        X = self._to_array(self._data_in["X"])
+        for plugin in self._plugins:
+            plugin.fit_plugin(X)
+            X = plugin.transform_plugin(X)
+        self.output_data = self._data_in.derive()
+        self.output_data.append_data_column("X", self._as_data(X))
+        if "X_test" in self._data_in.keys() and self._data_in["X_test"] is not None:
+            X_test = self._to_array(self._data_in["X_test"])
+            for plugin in self._plugins:
+                X_test = plugin.transform_plugin(X_test)
+            self.output_data.append_data_column("X_test", self._as_data(X_test))
+
+    def get_result(self) -> DataInterface:
+        return self.output_data
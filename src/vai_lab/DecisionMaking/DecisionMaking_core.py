@@ -27,14 +27,22 @@ class DecisionMaking(object):
         self._module_config = module_config
 
     def launch(self):
+        """Runs the plugin methods, then stores the suggested locations
+        in the output data as X_suggest
+        """
+        suggestion = None
         for method in self._module_config["plugin"]["methods"]["_order"]:
             if "options" in self._module_config["plugin"]["methods"][method].keys():
                 out = getattr(self._plugin, "{}".format(method))(self._plugin._parse_options_dict(self._module_config["plugin"]["methods"][method]["options"]))
             else:
                 out = getattr(self._plugin, "{}".format(method))()
+            if method == "suggest_next_locations":
+                suggestion = out
 
-        self.output_data = self._data_in.copy()
-        self.output_data = self._plugin.suggest_locations()
+        if suggestion is None:
+            suggestion = self._plugin.suggest_next_locations()
+        self.output_data = self._data_in.derive()
+        self.output_data.append_data_column("X_suggest", suggestion)
 
     def get_result(self):
         return self.output_data
\ No newline at end of file
@@ -0,0 +1,199 @@
+import ast
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.stats import norm
+from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+from vai_lab._plugin_templates import DecisionMakingPluginT
+from vai_lab.Modelling.plugins.gpregressor import GPRegressor, model
+
+_PLUGIN_READABLE_NAMES = {"BayesianOptimisation": "default",
+                          "BayesianOptimization": "alias",
+                          "BO": "alias"}                            # type:ignore
+_PLUGIN_MODULE_OPTIONS = {"Type": "optimisation"}                   # type:ignore
+_PLUGIN_REQUIRED_SETTINGS = {"bounds": "list"}                      # type:ignore
+_PLUGIN_OPTIONAL_SETTINGS = {"acquisition": "str",
+                             "batch_size": "int",
+                             "batch_method": "str",
+                             "maximise": "bool",
+                             "xi": "float",
+                             "kappa": "float",
+                             "n_candidates": "int",
+                             "n_restarts_optimizer": "int",
+                             "random_state": "int"}                 # type:ignore
+_PLUGIN_REQUIRED_DATA = {"X", "Y"}                                  # type:ignore
+_PLUGIN_OPTIONAL_DATA = {}                                          # type:ignore
+
+
+class BayesianOptimisation(DecisionMakingPluginT):
+    """
+    Bayesian optimisation with a Gaussian process surrogate.
+    Suggests batches of points which can be evaluated concurrently
+    """
+
+    def __init__(self, config = {}, data_in = [None], ini = False):
+        """Initialises parent class.
+            Passes `globals` dict of all current variables
+        """
+        super().__init__(globals())
+        if not ini:
+            # Model configuration
+            self.set_data_in(data_in)
+            self.configure(config)
+            try:
+                self._set_options(self._config["options"])
+                # Surrogate model
+                self.model = GPRegressor(self._surrogate_config(), data_in)
+            except Exception as exc:
+                print('The plugin encountered an error on the parameters of '
+                        +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
+                raise
+        else:
+            self.model = model
+
+        self._fitted = False
+        self.opt_plugin = self.fit_surrogate
+        self.suggest_plugin = self.suggest
+
+    def _parse_bounds(self, bounds) -> np.ndarray:
+        """Bounds are given as "[(lower, upper), ...]" or as a flat list of
+        lower and upper bounds of each dimension
+        """
+        if isinstance(bounds, str):
+            bounds = ast.literal_eval(bounds)
+        return np.asarray(bounds, dtype=float).reshape(-1, 2)
+
+    def _set_options(self, options: dict) -> None:
+        self.bounds = self._parse_bounds(options["bounds"])
+        self.acquisition = str(options.get("acquisition", "EI")).upper()
+        self.batch_size = int(self._scalar(options.get("batch_size", 1)))
+        self.batch_method = str(options.get("batch_method", "local_penalisation")).lower()
+        self._sign = 1 if options.get("maximise", False) else -1
+        self.xi = float(self._scalar(options.get("xi", 0.01)))
+        self.kappa = float(self._scalar(options.get("kappa", 2.0)))
+        self.n_candidates = int(self._scalar(options.get("n_candidates", 2000)))
+        self.n_restarts_optimizer = int(self._scalar(options.get("n_restarts_optimizer", 2)))
+        self.random_state = self._scalar(options.get("random_state", None))
+        self._rng = np.random.default_rng(self.random_state)
+        if self.acquisition not in ("EI", "UCB"):
+            raise ValueError("acquisition must be EI or UCB, not {0}".format(self.acquisition))
+        if self.batch_method not in ("local_penalisation", "kriging_believer"):
+            raise ValueError("batch_method must be local_penalisation or kriging_believer, not {0}"
+                             .format(self.batch_method))
+
+    def _surrogate_config(self) -> dict:
+        """Configuration of the GPRegressor plugin used as surrogate"""
+        width = np.maximum(self.bounds[:, 1] - self.bounds[:, 0], 1e-3)
+        kernel = ConstantKernel(1.0) * Matern(length_scale=width/2, nu=2.5) \
+            + WhiteKernel(1e-6, noise_level_bounds=(1e-10, 1e1))
+        return {"plugin_name": "GPRegressor",
+                "options": {"kernel": kernel,
+                            "normalize_y": True,
+                            "n_restarts_optimizer": self.n_restarts_optimizer,
+                            "random_state": self.random_state},
+                "methods": {"_order": []}}
+
+    def fit_surrogate(self):
+        """Fits the surrogate to the evaluated points X and their objective values Y"""
+        self._X = np.asarray(self.X, dtype=float)
+        if self._X.ndim == 1:
+            self._X = self._X.reshape(-1, 1)
+        # The surrogate always models a maximisation problem
+        self._y = self._sign * np.asarray(self.Y, dtype=float).ravel()
+        self.model.fit([self._X, self._y])
+        self._fitted = True
+        return self.model.model
+
+    def _acquisition(self, X, gp, best: float) -> np.ndarray:
+        mu, sigma = gp.predict(X, return_std=True)
+        sigma = np.maximum(sigma, 1e-12)
+        if self.acquisition == "UCB":
+            return mu + self.kappa * sigma
+        improvement = mu - best - self.xi
+        z = improvement / sigma
+        return improvement * norm.cdf(z) + sigma * norm.pdf(z)
+
+    def _maximise(self, func) -> np.ndarray:
+        """Maximises func over the bounds. Random candidates are evaluated
+        first, then the best ones are refined with L-BFGS-B
+        """
+        candidates = self._rng.uniform(self.bounds[:, 0], self.bounds[:, 1],
+                                       size=(self.n_candidates, len(self.bounds)))
+        values = func(candidates)
+        best_x, best_val = candidates[np.argmax(values)], np.max(values)
+        for x0 in candidates[np.argsort(values)[-5:]]:
+            res = minimize(lambda x: -func(x.reshape(1, -1))[0], x0,
+                           method="L-BFGS-B", bounds=self.bounds)
+            if -res.fun > best_val:
+                best_x, best_val = res.x, -res.fun
+        return best_x
+
+    def _lipschitz(self, gp) -> float:
+        """Largest norm of the gradient of the posterior mean,
+        estimated by finite differences on random points
+        """
+        d = len(self.bounds)
+        points = self._rng.uniform(self.bounds[:, 0], self.bounds[:, 1],
+                                   size=(min(500, self.n_candidates), d))
+        step = 1e-4 * np.maximum(self.bounds[:, 1] - self.bounds[:, 0], 1e-3)
+        mu = gp.predict(points)
+        grads = np.stack([(gp.predict(points + np.eye(d)[i]*step[i]) - mu)/step[i]
+                          for i in range(d)], axis=1)
+        lipschitz = np.linalg.norm(grads, axis=1).max()
+        # A flat mean gives no information on the distance between points
+        return lipschitz if lipschitz > 1e-7 else 10.
+
+    def _kriging_believer(self, gp) -> np.ndarray:
+        """Each suggested point is added to the data with the predicted mean as
+        its value, and the surrogate is refitted with fixed hyperparameters
+        """
+        X, y = self._X, self._y
+        batch = []
+        for i in range(self.batch_size):
+            best = y.max()
+            x = self._maximise(lambda C: self._acquisition(C, gp, best))
+            batch.append(x)
+            if i < self.batch_size - 1:
+                X = np.vstack([X, x])
+                y = np.append(y, gp.predict(x.reshape(1, -1)))
+                gp = model(kernel=self.model.model.kernel_, optimizer=None,
+                           normalize_y=True).fit(X, y)
+        return np.array(batch)
+
+    def _local_penalisation(self, gp) -> np.ndarray:
+        """The acquisition is multiplied by a penaliser around each point already
+        in the batch, whose radius follows from a Lipschitz constant of the
+        objective (Gonzalez et al., 2016). The surrogate is fitted once
+        """
+        best = self._y.max()
+        lipschitz = self._lipschitz(gp)
+        penalisers = []
+
+        def penalised(C):
+            # softplus keeps the acquisition positive before penalising
+            acq = np.logaddexp(0, self._acquisition(C, gp, best))
+            for xj, mu, sigma in penalisers:
+                dist = np.linalg.norm(C - xj, axis=1)
+                acq = acq * norm.cdf((lipschitz*dist - best + mu)/sigma)
+            return acq
+
+        batch = []
+        for _ in range(self.batch_size):
+            x = self._maximise(penalised)
+            batch.append(x)
+            mu, sigma = gp.predict(x.reshape(1, -1), return_std=True)
+            penalisers.append((x, mu[0], max(sigma[0], 1e-12)))
+        return np.array(batch)
+
+    def suggest(self) -> np.ndarray:
+        """Suggests the next batch_size points to evaluate
+
+        :returns: array, shape (batch_size, n_dimensions)
+        """
+        if not self._fitted:
+            self.fit_surrogate()
+        gp = self.model.model
+        if self.batch_size == 1 or self.batch_method == "kriging_believer":
+            return self._kriging_believer(gp)
+        return self._local_penalisation(gp)
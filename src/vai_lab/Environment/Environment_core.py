@@ -31,8 +31,8 @@ class Environment(object):
         self._plugin.connect()
         self._plugin.load_model()
         self._plugin.run_simulation()
-        
+        self.output_data = self._data_in.derive()
+        self.output_data = self._plugin._test(self.output_data)
 
     def get_result(self) -> DataInterface:
-        # return self.output_data
-        return self._data_in
\ No newline at end of file
+        return self.output_data
\ No newline at end of file
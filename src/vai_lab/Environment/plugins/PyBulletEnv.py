@@ -1,8 +1,11 @@
-from attr import attr
 from vai_lab._plugin_templates import EnvironmentPluginT
 from vai_lab._import_helper import rel_to_abs
-from typing import Any, Dict
+from vai_lab._types import DataInterface
+from vai_lab.Environment.rollout_buffer import RolloutBuffer
+from typing import Any, Dict, List
+import numpy as np
 import pybullet as p
+from pybullet_utils.bullet_client import BulletClient
 from time import sleep
 
 
@@ -10,21 +13,26 @@ _PLUGIN_READABLE_NAMES = {"PyBullet":"default"}
 _PLUGIN_MODULE_OPTIONS = {}                                                                     # type:ignore
 _PLUGIN_REQUIRED_SETTINGS = {"model_dir": "str", "headless": "bool",
                                 "timestep":"float", "max_steps":"int"}                          # type:ignore
-_PLUGIN_OPTIONAL_SETTINGS = {"gravity":"list"}                                                  # type:ignore
+_PLUGIN_OPTIONAL_SETTINGS = {"gravity":"list", "num_envs":"int",
+                             "buffer_size":"int", "random_torque":"float"}                      # type:ignore
 _PLUGIN_REQUIRED_DATA = {}                                                                      # type:ignore
 _PLUGIN_OPTIONAL_DATA = {"X","Y","X_tst", 'Y_tst'}                                              # type:ignore
 
 
 class PyBulletEnv(EnvironmentPluginT):
     """
-    Loads the pybullet library as wildcard and exposes all functions
+    Loads the pybullet library as wildcard and exposes all functions.
+    Simulates num_envs copies of the environment, each in its own client
     """
 
     def __init__(self, config = {}, data_in = [None]) -> None:
         super().__init__(globals())
         self.model_ids: Dict = {}
+        self.clients: List[BulletClient] = []
+        self.buffer = None
         self.set_data_in(data_in)
         self.configure(config)
+        self.num_envs = int(self._config["options"].get("num_envs", 1))
 
     def set_gui(self, use_gui: bool = True):
         if type(use_gui) == str:
@@ -35,64 +43,171 @@ class PyBulletEnv(EnvironmentPluginT):
             self.connection_mode = p.DIRECT  # Use pybullet without GUI
 
     def connect(self):
-        self.physicsClient = p.connect(self.connection_mode)
+        """Connects one client per environment. Only the first one can use the GUI"""
+        self.clients = [BulletClient(connection_mode=self.connection_mode if i == 0 else p.DIRECT)
+                        for i in range(self.num_envs)]
+        self.physicsClient = self.clients[0]._client
 
     def disconnect(self):
-        return p.disconnect()
+        for client in self.clients:
+            client.disconnect()
+        self.clients = []
 
     def reset(self):
-        return p.resetSimulation()
+        for client in self.clients:
+            client.resetSimulation()
 
-    def load_pb_data(self):
+    def load_pb_data(self, client: BulletClient):
         import pybullet_data                                        # type:ignore
-        p.setAdditionalSearchPath(pybullet_data.getDataPath())
+        client.setAdditionalSearchPath(pybullet_data.getDataPath())
 
-    def _load_model_by_type(self, model):
+    def _load_model_by_type(self, model, client: BulletClient):
         model = rel_to_abs(model)
         ext = model.split(".")[-1]
         name = model.split("/")[-1].split(".")[0]
         if name == "plane":
-            self.load_pb_data()
+            self.load_pb_data(client)
         if ext == "urdf":
-            self.model_ids[name] = p.loadURDF(model)
+            self.model_ids[name] = client.loadURDF(model)
         elif ext == "sdf":
-            self.model_ids[name] = p.loadSDF(model, 1, 1.0)
+            self.model_ids[name] = client.loadSDF(model, 1, 1.0)
         elif ext == "xml":
-            self.model_ids[name] = p.loadMJCF(model)
+            self.model_ids[name] = client.loadMJCF(model)
 
     def load_model(self) -> None:
+        """Loads the models into every client. Models get the same ids in all clients"""
         model_paths = self._config["options"]["model_dir"]
         if type(model_paths) == str:
-            self._load_model_by_type(model_paths)
-        elif type(model_paths) == list:
+            model_paths = [model_paths]
+        for client in self.clients:
             for model in model_paths:
-                self._load_model_by_type(model)
+                self._load_model_by_type(model, client)
+        self._bodies = self._dynamic_bodies()
+
+    def _dynamic_bodies(self) -> List[int]:
+        """Ids of the loaded bodies which can move"""
+        client = self.clients[0]
+        bodies = []
+        for ids in self.model_ids.values():
+            for body in (ids if isinstance(ids, (tuple, list)) else [ids]):
+                if client.getNumJoints(body) > 0 or client.getDynamicsInfo(body, -1)[0] > 0:
+                    bodies.append(body)
+        return bodies
+
+    def _joints(self, body: int) -> List[int]:
+        """Indices of the non-fixed joints of a body"""
+        client = self.clients[0]
+        return [j for j in range(client.getNumJoints(body))
+                if client.getJointInfo(body, j)[2] != p.JOINT_FIXED]
 
     def _set_options(self):
         api_list = dir(p)
-        for key, value in self._config["options"].items():
-            if key in api_list:
-                getattr(p,key)(*value)
-        if "timestep" in self._config["options"]:
-            p.setPhysicsEngineParameter(
-                fixedTimeStep=self._config["options"]["timestep"])
-        elif "max_steps" in self._config["options"]:
-            p.setPhysicsEngineParameter(
-                numSolverIterations=self._config["options"]["max_steps"])
+        for client in self.clients:
+            for key, value in self._config["options"].items():
+                if key in api_list:
+                    getattr(client, key)(*value)
+            if "timestep" in self._config["options"]:
+                client.setPhysicsEngineParameter(
+                    fixedTimeStep=self._config["options"]["timestep"])
+            elif "max_steps" in self._config["options"]:
+                client.setPhysicsEngineParameter(
+                    numSolverIterations=self._config["options"]["max_steps"])
+
+    def _observe_env(self, client: BulletClient) -> np.ndarray:
+        obs = []
+        for body in self._bodies:
+            pos, orn = client.getBasePositionAndOrientation(body)
+            lin, ang = client.getBaseVelocity(body)
+            obs += [pos, orn, lin, ang]
+            joints = self._joints(body)
+            if len(joints) > 0:
+                states = client.getJointStates(body, joints)
+                obs += [[s[0] for s in states], [s[1] for s in states]]
+        return np.concatenate(obs) if len(obs) > 0 else np.zeros(0)
+
+    def observe(self) -> np.ndarray:
+        """Base position, orientation and velocities, joint positions and
+        joint velocities of all moving bodies
+
+        :returns: array, shape (num_envs, n_observations)
+        """
+        return np.stack([self._observe_env(client) for client in self.clients])
+
+    def step(self, actions=None) -> np.ndarray:
+        """Steps all environments together
+
+        :param actions [optional]: array of shape (num_envs, n_joints),
+                        torques applied to the non-fixed joints of the moving bodies
+        :returns: array of stacked observations, shape (num_envs, n_observations)
+        """
+        for i, client in enumerate(self.clients):
+            if actions is not None:
+                start = 0
+                for body in self._bodies:
+                    joints = self._joints(body)
+                    if len(joints) == 0:
+                        continue
+                    # Default velocity motors would counteract the torques
+                    client.setJointMotorControlArray(body, joints, p.VELOCITY_CONTROL,
+                                                     forces=[0.]*len(joints))
+                    client.setJointMotorControlArray(body, joints, p.TORQUE_CONTROL,
+                                                     forces=actions[i][start:start + len(joints)])
+                    start += len(joints)
+            client.stepSimulation()
+        return self.observe()
+
+    def _reward(self) -> np.ndarray:
+        """Forward (x) velocity of the first moving body in each environment"""
+        if len(self._bodies) == 0:
+            return np.zeros(len(self.clients))
+        return np.array([client.getBaseVelocity(self._bodies[0])[0][0]
+                         for client in self.clients])
+
+    def _actions(self, n_joints: int, rng) -> np.ndarray:
+        """Uniformly random joint torques of at most random_torque, zero by default"""
+        scale = float(self._config["options"].get("random_torque", 0.))
+        if scale > 0:
+            return rng.uniform(-scale, scale, size=(len(self.clients), n_joints))
+        return np.zeros((len(self.clients), n_joints))
 
     def run_simulation(self):
+        """Steps all environments for max_steps steps and records the states,
+        actions and rewards of each step into a ring buffer of buffer_size steps.
+        Runs in real time unless headless is True
+        """
         self._set_options()
-        for step in range(1, self._config["options"]["max_steps"]):
-            p.stepSimulation()
-            sleep(self._config["options"]["timestep"])
+        headless = self._config["options"].get("headless", False)
+        max_steps = self._config["options"]["max_steps"]
+        n_joints = sum(len(self._joints(body)) for body in self._bodies)
+        obs = self.observe()
+        self.buffer = RolloutBuffer(int(self._config["options"].get("buffer_size", max(max_steps - 1, 1))),
+                                    len(self.clients), obs.shape[1], n_joints)
+        rng = np.random.default_rng()
+        for step in range(1, max_steps):
+            actions = self._actions(n_joints, rng)
+            next_obs = self.step(actions if n_joints > 0 and actions.any() else None)
+            self.buffer.append(obs, actions, self._reward())
+            obs = next_obs
+            if not headless:
+                sleep(self._config["options"]["timestep"])
         self.disconnect()
 
+    def _test(self, data: DataInterface) -> DataInterface:
+        """Adds the recorded rollouts to data, see RolloutBuffer.to_dict"""
+        if self.buffer is not None:
+            for key, val in self.buffer.to_dict().items():
+                data.append_data_column(key, val)
+        return data
+
     def __getattr__(self, attr: str) -> Any:
-        """Allows calling pybullet functions directly as if they were functions of this class
+        """Allows calling pybullet functions directly as if they were functions of this class.
+        Functions are called on the first environment once connected
 
         TODO: This is probably not the best way to do this, but pybullet is
         a compiled module and cannot be used as a parent. This is a workaround.
         """
+        if attr != "clients" and len(self.__dict__.get("clients", [])) > 0:
+            return getattr(self.clients[0], attr)
         return getattr(p, attr)
 
 
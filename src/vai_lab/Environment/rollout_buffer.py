@@ -0,0 +1,72 @@
+"""Fixed-size ring buffer of environment rollouts."""
+from typing import Dict
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+
+class RolloutBuffer:
+    """Stores states, actions and rewards of every step of num_envs environments
+    in preallocated arrays. Once full, the oldest steps are overwritten.
+    """
+
+    def __init__(self,
+                 capacity: int,
+                 num_envs: int,
+                 state_dim: int,
+                 action_dim: int,
+                 dtype=np.float32) -> None:
+        """
+        :param capacity: int, number of steps kept
+        :param num_envs: int, number of environments stepped together
+        :param state_dim: int, number of observations per environment
+        :param action_dim: int, number of actions per environment
+        :param dtype [optional]: numpy dtype of the stored values
+        """
+        self.capacity = capacity
+        self.states = np.zeros((capacity, num_envs, state_dim), dtype=dtype)
+        self.actions = np.zeros((capacity, num_envs, action_dim), dtype=dtype)
+        self.rewards = np.zeros((capacity, num_envs), dtype=dtype)
+        self._pos = 0
+        self.size = 0
+
+    def append(self, states, actions, rewards) -> None:
+        """Writes one step of all environments
+
+        :param states: array, shape (num_envs, state_dim), states before the step
+        :param actions: array, shape (num_envs, action_dim)
+        :param rewards: array, shape (num_envs,), rewards after the step
+        """
+        self.states[self._pos] = states
+        self.actions[self._pos] = actions
+        self.rewards[self._pos] = rewards
+        self._pos = (self._pos + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _ordered(self, arr: np.ndarray) -> np.ndarray:
+        """Steps in chronological order. A view unless the buffer wrapped around"""
+        if self.size < self.capacity:
+            return arr[:self.size]
+        return np.concatenate([arr[self._pos:], arr[:self._pos]])
+
+    def to_dict(self) -> Dict:
+        """Returns the recorded steps in chronological order as
+            states: array (n_steps, num_envs, state_dim)
+            actions: array (n_steps, num_envs, action_dim)
+            rewards: array (n_steps, num_envs)
+            X: DataFrame of state-action pairs with columns State_i and Action_j,
+               one row per step and environment
+            Y: DataFrame with the Reward of each row of X
+        """
+        states = self._ordered(self.states)
+        actions = self._ordered(self.actions)
+        rewards = self._ordered(self.rewards)
+        state_cols = {"State_{0}".format(i): states[..., i].reshape(-1)
+                      for i in range(states.shape[-1])}
+        action_cols = {"Action_{0}".format(i): actions[..., i].reshape(-1)
+                       for i in range(actions.shape[-1])}
+        return {"states": states,
+                "actions": actions,
+                "rewards": rewards,
+                "X": pd.DataFrame({**state_cols, **action_cols}, copy=False),
+                "Y": pd.DataFrame({"Reward": rewards.reshape(-1)}, copy=False)}
@@ -0,0 +1,137 @@
+"""Progress tracker window running in its own process.
+
+The tracker is started as ``python -m vai_lab.GUI.tracker_process``, so the
+script running the pipeline is not imported again in the tracker process and
+needs no ``if __name__ == "__main__"`` guard. Progress events of Core are
+pickled into the stdin of the tracker and the pipeline never waits for the
+window. Requests from the window, e.g. to stop the pipeline, are written back
+as lines on its stdout, which Core polls. The tracker closes itself when its
+stdin is closed, i.e. when the pipeline process exits.
+"""
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+import traceback
+from typing import Dict
+
+
+def _run_tracker(xml_filename: str, status: Dict, events, control, debug: bool) -> None:
+    from vai_lab.GUI.GUI_core import GUI
+    from vai_lab._plugin_helpers import PluginSpecs
+    gui_app = GUI()
+    gui_app._debug = debug
+    gui_app._events = events
+    gui_app._control = control
+    gui_app.set_avail_plugins(PluginSpecs.shared())
+    gui_app.set_gui_as_progress_tracker(status)
+    gui_app._append_to_output("xml_filename", xml_filename)
+    gui_app.launch()
+
+
+class _ControlWriter:
+    """Sends requests of the window to the pipeline, one per line"""
+
+    def __init__(self, stream) -> None:
+        self._stream = stream
+
+    def put(self, request: str) -> None:
+        try:
+            self._stream.write(request + "\n")
+            self._stream.flush()
+        except (OSError, ValueError):
+            # The pipeline has already exited
+            pass
+
+
+def _read_events(stream, events: queue.Queue) -> None:
+    """Forwards pickled events from stream to the events queue.
+    Exits the tracker once the pipeline closes the stream
+    """
+    try:
+        while True:
+            events.put(pickle.load(stream))
+    except (EOFError, OSError, pickle.UnpicklingError):
+        pass
+    os._exit(0)
+
+
+def main() -> None:
+    """Entry point of the tracker process"""
+    stdin = sys.stdin.buffer
+    # Keep stdout for control requests, anything the GUI prints goes to stderr
+    control = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    xml_filename, status, debug = pickle.load(stdin)
+    events: queue.Queue = queue.Queue()
+    threading.Thread(target=_read_events, args=(stdin, events), daemon=True).start()
+    exit_code = 0
+    try:
+        _run_tracker(xml_filename, status, events, _ControlWriter(control), debug)
+    except Exception:
+        traceback.print_exc()
+        exit_code = 1
+    # The reader thread may be blocked on stdin, which would hang the interpreter shutdown
+    sys.stderr.flush()
+    os._exit(exit_code)
+
+
+class TrackerProcess:
+    def __init__(self, xml_filename: str, status: Dict, debug: bool = False) -> None:
+        """
+        :param xml_filename: str, pipeline drawn by the tracker
+        :param status: dict of module names to their status at launch
+        :param debug [optional]: bool, do not enter the Tk main loop
+        """
+        self._args = (xml_filename, status, debug)
+        self._process = None
+        self._lock = threading.Lock()
+        self._terminate = False
+
+    def start(self) -> None:
+        self._process = subprocess.Popen([sys.executable, "-m", "vai_lab.GUI.tracker_process"],
+                                         stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE)
+        self._send(self._args)
+        threading.Thread(target=self._read_control, daemon=True).start()
+
+    def _send(self, obj) -> None:
+        with self._lock:
+            try:
+                pickle.dump(obj, self._process.stdin, protocol=pickle.HIGHEST_PROTOCOL)
+                self._process.stdin.flush()
+            except (OSError, ValueError):
+                # The window was closed
+                pass
+
+    def _read_control(self) -> None:
+        for line in self._process.stdout:
+            if line.strip() == b"terminate":
+                self._terminate = True
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def __call__(self, event: Dict) -> None:
+        """Event stream subscriber, forwards events to the window"""
+        if self.is_alive():
+            self._send(event)
+
+    def close(self) -> None:
+        """Closes the window"""
+        if self._process is not None:
+            with self._lock:
+                try:
+                    self._process.stdin.close()
+                except OSError:
+                    pass
+
+    def terminate_requested(self) -> bool:
+        """Checks, without waiting, if the pipeline should be stopped"""
+        return self._terminate
+
+
+if __name__ == "__main__":
+    main()
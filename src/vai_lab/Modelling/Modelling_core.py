@@ -19,6 +19,7 @@ class Modelling(object):
                                 avail_plugins["_PLUGIN_PACKAGE"],\
                                 avail_plugins["_PLUGIN_CLASS_NAME"])\
                                 .__call__(self._module_config["plugin"], data_in)
+        self._plugin._module_name = self._module_config["name"]
 
     def set_options(self, module_config: dict):
         """Send configuration arguments to plugin
@@ -35,7 +36,7 @@ class Modelling(object):
             else:
                 out = getattr(self._plugin, "{}".format(method))()
 
-        self.output_data = self._data_in.copy()
+        self.output_data = self._data_in.derive()
         self.output_data = self._plugin._test(self.output_data)
 
     def get_result(self):
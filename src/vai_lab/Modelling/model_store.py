@@ -0,0 +1,70 @@
+"""On-disk store of fitted plugin models.
+
+Models are serialised with joblib and keyed by the name of the module they
+were fitted in and a hash of the plugin configuration, so a later pipeline
+can predict with a stored model instead of refitting it.
+"""
+import hashlib
+import json
+import os
+from typing import Any
+
+from vai_lab._import_helper import rel_to_abs
+
+
+def config_hash(plugin_name: str, options: dict) -> str:
+    """Hash of a plugin name and the options the model is constructed with
+
+    :param plugin_name: str, name of plugin as given in the XML config
+    :param options: dict of plugin options
+    :returns: str hex digest
+    """
+    encoded = json.dumps({"plugin_name": plugin_name, "options": options},
+                         sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ModelStore:
+    def __init__(self, store_dir: str) -> None:
+        """
+        :param store_dir: str, directory in which models are stored
+        """
+        self.store_dir = rel_to_abs(store_dir)
+
+    def path(self, module_name: str, key: str) -> str:
+        return os.path.join(self.store_dir, module_name, key + ".joblib")
+
+    def exists(self, module_name: str, key: str) -> bool:
+        return os.path.exists(self.path(module_name, key))
+
+    def save(self, model: Any, module_name: str, key: str) -> str:
+        """Serialises a fitted model
+
+        :param model: fitted model, e.g. sklearn estimator
+        :param module_name: str, name of module the model was fitted in
+        :param key: str, hash of the plugin configuration
+        :returns filename: str, file the model was written to
+        """
+        import joblib  # type: ignore
+        filename = self.path(module_name, key)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        joblib.dump(model, filename + ".tmp")
+        os.replace(filename + ".tmp", filename)
+        return filename
+
+    def load(self, module_name: str, key: str, mmap: bool = True) -> Any:
+        """Loads a stored model
+
+        :param module_name: str, name of module the model was fitted in
+        :param key: str, hash of the plugin configuration
+        :param mmap [optional]: bool, memory-map large numpy arrays instead
+                    of reading them into memory
+        :returns model: fitted model
+        """
+        import joblib  # type: ignore
+        filename = self.path(module_name, key)
+        if not os.path.exists(filename):
+            raise FileNotFoundError(
+                "No stored model for module \"{0}\" with this configuration in {1}"
+                .format(module_name, self.store_dir))
+        return joblib.load(filename, mmap_mode="r" if mmap else None)
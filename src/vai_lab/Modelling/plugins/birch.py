@@ -35,4 +35,5 @@ class Birch(ModellingPluginT):
             self.model = model
             
         self.fit_plugin = self.model.fit
+        self.partial_fit_plugin = self.model.partial_fit
         self.predict_plugin = self.model.predict
\ No newline at end of file
@@ -1,5 +1,8 @@
+from inspect import signature
+
 from vai_lab._plugin_templates import ModellingPluginT
 from sklearn.cluster import KMeans as model
+from sklearn.cluster import MiniBatchKMeans
 
 _PLUGIN_READABLE_NAMES = {"KMeans": "default"}      # type:ignore
 _PLUGIN_MODULE_OPTIONS = {"Type": "clustering"}     # type:ignore
@@ -12,6 +15,7 @@ _PLUGIN_OPTIONAL_DATA = {"Y", "X_tst", 'Y_tst'}     # type:ignore
 class KMeans(ModellingPluginT):
     """
     K-Means clustering
+    Uses Mini-Batch K-Means if the partial_fit method is requested
     """
 
     def __init__(self, config = {}, data_in = [None], ini = False):
@@ -25,7 +29,10 @@ class KMeans(ModellingPluginT):
             self.configure(config)
             # Model initialisation    
             try:    
-                self.model = model(**self._config["options"])
+                if "partial_fit" in self._config.get("methods", {}).get("_order", []):
+                    self.model = MiniBatchKMeans(**self._mini_batch_options(self._config["options"]))
+                else:
+                    self.model = model(**self._config["options"])
             except Exception as exc:
                 print('The plugin encountered an error on the parameters of '
                         +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
@@ -34,5 +41,15 @@ class KMeans(ModellingPluginT):
             self.model = model
             
         self.fit_plugin = self.model.fit
+        if isinstance(self.model, MiniBatchKMeans):
+            self.partial_fit_plugin = self.model.partial_fit
         self.predict_plugin = self.model.predict
-        self.score_plugin = self.model.score
\ No newline at end of file
+        self.score_plugin = self.model.score
+
+    def _mini_batch_options(self, options: dict) -> dict:
+        """Drops options of KMeans which MiniBatchKMeans does not take, e.g. algorithm"""
+        params = signature(MiniBatchKMeans).parameters
+        ignored = [key for key in options if key not in params]
+        if len(ignored) > 0:
+            print('Options not used by Mini-Batch K-Means: {0}'.format(', '.join(ignored)))
+        return {key: val for key, val in options.items() if key in params}
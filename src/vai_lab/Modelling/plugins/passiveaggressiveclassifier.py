@@ -35,6 +35,6 @@ class PassiveAggressiveClassifier(ModellingPluginTClass):
             self.model = model
             
         self.fit_plugin = self.model.fit
+        self.partial_fit_plugin = self.model.partial_fit
         self.predict_plugin = self.model.predict
-        self.predict_proba_plugin = self.model.predict_proba
         self.score_plugin = self.model.score
\ No newline at end of file
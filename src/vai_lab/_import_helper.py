@@ -34,6 +34,17 @@ def get_lib_parent_dir():
                 if __file__[:i].\
                 endswith("{0}vai_lab{0}".format(path.sep))][-1]
 
+def get_cache_dir() -> str:
+    """Returns the directory of caches kept across runs, e.g. the plugin registry.
+    Set with the VAI_LAB_CACHE_DIR environment variable
+
+    :returns: str of absolute path of the cache dir
+    """
+    from os import environ
+    default = path.join(environ.get("XDG_CACHE_HOME", path.join(path.expanduser("~"), ".cache")),
+                        "vai_lab")
+    return environ.get("VAI_LAB_CACHE_DIR", default)
+
 def rel_to_abs(filename: str) -> str:
         """Checks if path is relative or absolute
         If absolute, returns original path 
@@ -1,29 +1,136 @@
 import ast
+import hashlib
 import os
-from typing import Iterator, List, Union
+import pickle
+import sys
+import tempfile
+from threading import Lock
+from typing import Dict, Iterator, List, Tuple, Union
 
+from vai_lab._import_helper import get_cache_dir
 from vai_lab._types import DictT
 
+_CACHE_VERSION = 1
+
+
+def _file_sha1(filename: str) -> str:
+    with open(filename, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
 
 class PluginSpecs(ast.NodeVisitor):
-    def __init__(self) -> None:
+    _shared = None
+    _shared_lock = Lock()
+
+    def __init__(self, use_cache: bool = True) -> None:
+        """Finds all plugins and parses their specs.
+        Specs are stored in a cache file, so plugin files are only parsed again
+        if they were added, removed or changed since the cache was written.
+
+        :param use_cache [optional]: bool, read and write the cache file
+        """
         self.module_dirs: DictT = {}
         self.available_plugins: DictT = {}
         self._get_plugin_files()
-        self._get_plugin_specs()
+        self._stats = self._file_stats()
+        if not (use_cache and self._load_cache()):
+            self._get_plugin_specs()
+            if use_cache:
+                self._save_cache()
+
+    @classmethod
+    def shared(cls) -> "PluginSpecs":
+        """Returns an instance shared within the process.
+        It is rebuilt if plugin files were added, removed or modified since.
+        """
+        with cls._shared_lock:
+            if cls._shared is None or not cls._shared._is_current():
+                cls._shared = cls()
+            return cls._shared
 
     def _get_plugin_files(self, root_dir: str = None) -> None:
+        self.module_dirs.update(self._find_plugin_files(root_dir))
+
+    def _find_plugin_files(self, root_dir: str = None) -> DictT:
         if root_dir is None:
             root_dir = os.path.dirname(os.path.realpath(__file__))
 
+        module_dirs: DictT = {}
         for mod_folder in self._get_clean_module_dirs(root_dir):
             mod_path = os.path.join(root_dir, mod_folder, "plugins")
             plugins = self._get_clean_module_dirs(mod_path)
 
-            self.module_dirs[mod_folder] = {}
-            self.module_dirs[mod_folder]["root"] = mod_path
-            self.module_dirs[mod_folder]["files"] = [
+            module_dirs[mod_folder] = {}
+            module_dirs[mod_folder]["root"] = mod_path
+            module_dirs[mod_folder]["files"] = [
                 f for f in plugins if f.endswith(".py")]
+        return module_dirs
+
+    def _file_stats(self, module_dirs: DictT = None) -> Dict[str, Tuple[int, int]]:
+        """Modification time and size of each plugin file"""
+        if module_dirs is None:
+            module_dirs = self.module_dirs
+        stats = {}
+        for mod in module_dirs.values():
+            for f in mod["files"]:
+                st = os.stat(os.path.join(mod["root"], f))
+                stats[os.path.join(mod["root"], f)] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def _is_current(self) -> bool:
+        """Checks, without parsing, that no plugin file changed since construction"""
+        return self._file_stats(self._find_plugin_files()) == self._stats
+
+    def _cache_file(self) -> str:
+        """One cache file per installation and Python version"""
+        key = "{0}|{1}".format(os.path.dirname(os.path.realpath(__file__)), sys.version)
+        return os.path.join(get_cache_dir(),
+                            "plugin_specs_{0}.pkl".format(hashlib.sha1(key.encode()).hexdigest()[:16]))
+
+    def _load_cache(self) -> bool:
+        """Loads the plugin specs from the cache file if it matches the plugin files.
+        Files with a new modification time are hashed, so touched but unchanged
+        files do not invalidate the cache.
+
+        :returns: bool, True if the specs were loaded
+        """
+        try:
+            with open(self._cache_file(), "rb") as f:
+                cache = pickle.load(f)
+        except Exception:
+            return False
+        if cache.get("version") != _CACHE_VERSION \
+                or cache.get("module_dirs") != self.module_dirs \
+                or set(cache["files"]) != set(self._stats):
+            return False
+        touched = False
+        for filename, (mtime, size, sha1) in cache["files"].items():
+            if self._stats[filename] != (mtime, size):
+                if self._stats[filename][1] != size or _file_sha1(filename) != sha1:
+                    return False
+                touched = True
+        self.available_plugins = cache["available_plugins"]
+        if touched:
+            self._save_cache()
+        return True
+
+    def _save_cache(self) -> None:
+        cache = {"version": _CACHE_VERSION,
+                 "module_dirs": self.module_dirs,
+                 "files": {filename: (*stat, _file_sha1(filename))
+                           for filename, stat in self._stats.items()},
+                 "available_plugins": self.available_plugins}
+        filename = self._cache_file()
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            # A unique temporary file, other processes may save the cache at the same time
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, filename)
+        except OSError:
+            # The cache is optional, e.g. if the home directory is read-only
+            pass
 
     def _get_clean_module_dirs(self, root_dir: str) -> List[str]:
         excludes = ["tests", "examples", "resources", "run_pipeline.py"]
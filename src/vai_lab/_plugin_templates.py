@@ -1,5 +1,8 @@
 from typing import Dict
 from vai_lab._types import DataInterface
+from vai_lab.Data.csv_stream import CSVChunkStream
+from vai_lab.Data.Data_core import is_sparse
+from vai_lab.Core.instrumentation import instrumented
 from abc import ABC, abstractmethod
 
 import numpy as np
@@ -77,11 +80,21 @@ class PluginTemplate:
     def _parse_config(self):
         """Parse incoming data and args, sets them as class variables"""
         self.X = self._get_data_if_exist(self._data_in, "X")
-        self.Y = np.array(self._get_data_if_exist(self._data_in, "Y")).ravel()
+        self.Y = self._ravel(self._get_data_if_exist(self._data_in, "Y"))
         self.X_test = self._get_data_if_exist(self._data_in, "X_test")
-        self.Y_test = np.array(self._get_data_if_exist(self._data_in, "Y_test")).ravel()
+        self.Y_test = self._ravel(self._get_data_if_exist(self._data_in, "Y_test"))
         self._clean_options()
 
+    def _ravel(self, data):
+        """Flattens data into a 1D array. Streams of chunks are returned as they are,
+        sparse targets are densified first
+        """
+        if isinstance(data, CSVChunkStream):
+            return data
+        if is_sparse(data):
+            return data.toarray().ravel()
+        return np.array(data).ravel()
+
     def _get_data_if_exist(self, data_dict: dict, key: str, default=None):
         """Returns data from incoming data if exists, else returns None
 
@@ -133,6 +146,10 @@ class PluginTemplate:
                     options_dict[key] = self.Y
         return options_dict
 
+    def _scalar(self, val):
+        """Single numbers are parsed from the XML config as lists of one item"""
+        return val[0] if isinstance(val, list) and len(val) == 1 else val
+
     def _clean_options(self):
         """Parses incoming plugin options in self._config["options"] 
                 and modifies DataInterface in-place
@@ -142,30 +159,37 @@ class PluginTemplate:
 
     def _test(self, data: DataInterface) -> DataInterface:
         """Run debug tests on data operations
+        Scores are stored in data as train_score and test_score, e.g. for loop conditions.
+        Results of a hyperparameter search are stored as well.
+        Training scores are skipped if the training data is streamed,
+        if the model was loaded from a model store or if train_score is False
         TODO: Investigate if all plugins need a score and predict method
         """
-        if self._PLUGIN_MODULE_OPTIONS['Type'] == 'classification':
-            print('Training accuracy: %.2f%%' %
-                  (self.score([self.X, self.Y])*100))  # type: ignore
+        train_score = not isinstance(self.X, CSVChunkStream) \
+            and not getattr(self, "_loaded", False) \
+            and getattr(self, "_predict_options", {}).get("train_score", True)
+        for key, val in getattr(self, "_search_results", {}).items():
+            data.append_data_column(key, val)
+        if self._PLUGIN_MODULE_OPTIONS['Type'] in ('classification', 'regression'):
+            Y_pred = self._predict_data(self.X_test) if self.X_test is not None else None
+            scores = {}
+            if train_score:
+                scores[("train_score", "Training")] = self._score_data(self.X, self.Y)
             if self.Y_test is not None:
-                print('Test accuracy: %.2f%%' %
-                      (self.score([self.X_test, self.Y_test])*100))
-            if self.X_test is not None:
-                data.append_data_column("Y_pred", self.predict(self.X_test))
-            return data
-        elif self._PLUGIN_MODULE_OPTIONS['Type'] == 'regression':
-            print('Training R2 score: %.3f' %
-                  (self.score([self.X, self.Y])))  # type: ignore
-            if self.Y_test is not None:
-                print('Test R2 score: %.3f' %
-                      (self.score([self.X_test, self.Y_test])))
-            if self.X_test is not None:
-                data.append_data_column("Y_pred", self.predict_plugin(self.X_test))
+                scores[("test_score", "Test")] = self._score_data(self.X_test, self.Y_test, Y_pred)
+            for (name, label), score in scores.items():
+                if self._PLUGIN_MODULE_OPTIONS['Type'] == 'classification':
+                    print('%s accuracy: %.2f%%' % (label, score*100))
+                else:
+                    print('%s R2 score: %.3f' % (label, score))
+                data.append_data_column(name, score)
+            if Y_pred is not None:
+                data.append_data_column("Y_pred", Y_pred)
             return data
         elif self._PLUGIN_MODULE_OPTIONS['Type'] == 'clustering':
             print('Clustering completed')
             if self.X_test is not None:
-                data.append_data_column("Y_pred", self.predict(self.X_test))
+                data.append_data_column("Y_pred", self._predict_data(self.X_test))
             return data
         else:
             return data
@@ -209,6 +233,7 @@ class DataProcessingT(PluginTemplate, ABC):
                 _cleaned[key] = self.Y
         return _cleaned
 
+    @instrumented
     def fit(self, options={}):
         try:
             if isinstance(options, list):
@@ -222,14 +247,21 @@ class DataProcessingT(PluginTemplate, ABC):
                      +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
             raise
 
+    def _as_data(self, out):
+        """Wraps transformed data in a DataFrame. Sparse matrices are kept as they are,
+        so sparse outputs, e.g. of OneHotEncoder, are never densified
+        """
+        return out if is_sparse(out) else pd.DataFrame(out)
+
+    @instrumented
     def transform(self, options={}) -> DataInterface:
         try:
             if isinstance(options, list):
-                return pd.DataFrame(self.transform_plugin(*options))
+                return self._as_data(self.transform_plugin(*options))
             elif isinstance(options, dict):
-                return pd.DataFrame(self.transform_plugin(**options)), options.keys()
+                return self._as_data(self.transform_plugin(**options)), options.keys()
             else:
-                return pd.DataFrame(self.transform_plugin(options))
+                return self._as_data(self.transform_plugin(options))
         except Exception as exc:
             print('The plugin encountered an error when transforming the data with '
                      +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
@@ -238,7 +270,236 @@ class DataProcessingT(PluginTemplate, ABC):
 class ModellingPluginT(PluginTemplate, ABC):
     def __init__(self, plugin_globals: dict) -> None:
         super().__init__(plugin_globals)
+        self._module_name = None
+        self._loaded = False
+        self._predict_options: Dict = {}
 
+    def configure(self, config: dict):
+        """Extended from PluginTemplate.configure
+        Removes options which set up the prediction of the test data,
+        so they are not passed on to the model:
+            predict_batch_size: int, predict in blocks of this many rows
+            predict_n_jobs: int, number of blocks predicted in parallel
+            predict_backend: str, joblib backend, "threading" (default) or "loky"
+            train_score: bool, compute the training score (default True)
+        """
+        super().configure(config)
+        for key in ["predict_batch_size", "predict_n_jobs", "predict_backend", "train_score"]:
+            if key in self._config["options"]:
+                self._predict_options[key] = self._scalar(self._config["options"].pop(key))
+
+    def _rows(self, X, start: int, stop: int):
+        return X.iloc[start:stop] if isinstance(X, (pd.DataFrame, pd.Series)) else X[start:stop]
+
+    def predict_batched(self,
+                        X,
+                        batch_size: int,
+                        n_jobs: int = 1,
+                        backend: str = "threading",
+                        method: str = "predict"):
+        """Predicts X in blocks of batch_size rows, running blocks in parallel.
+        Blocks are written in order into a preallocated output array, so only
+        the blocks in flight are held in memory besides the output.
+
+        :param X: array-like of shape (n_samples, n_features)
+        :param batch_size: int, number of rows predicted at once
+        :param n_jobs [optional]: int, number of parallel jobs, -1 for all CPUs
+        :param backend [optional]: str, joblib backend, e.g. "threading" or "loky"
+        :param method [optional]: str, plugin method used, e.g. "predict_proba"
+        :returns: array of shape (n_samples,) or (n_samples, n_outputs)
+        """
+        from joblib import Parallel, delayed  # type: ignore
+        predict = getattr(self, "{}_plugin".format(method))
+        if is_sparse(X) and X.format != "csr":
+            # Sparse matrices are sliced by rows in CSR format
+            X = X.tocsr()
+        n = X.shape[0]
+        bounds = [(i, min(i + batch_size, n)) for i in range(0, n, batch_size)]
+        blocks = Parallel(n_jobs=n_jobs, backend=backend, return_as="generator")(
+            delayed(predict)(self._rows(X, start, stop)) for start, stop in bounds)
+        out = None
+        for (start, stop), block in zip(bounds, blocks):
+            block = np.asarray(block)
+            if out is None:
+                out = np.empty((n,) + block.shape[1:], dtype=block.dtype)
+            elif block.dtype != out.dtype:
+                out = out.astype(np.result_type(out.dtype, block.dtype))
+            out[start:stop] = block
+        return out
+
+    def _predict_data(self, X):
+        """Predicts X, in batches if predict_batch_size is set"""
+        if self._predict_options.get("predict_batch_size"):
+            return self.predict_batched(X,
+                                        self._predict_options["predict_batch_size"],
+                                        self._predict_options.get("predict_n_jobs", 1),
+                                        self._predict_options.get("predict_backend", "threading"))
+        return self.predict(X)
+
+    def _score_data(self, X, Y, Y_pred=None):
+        """Scores the model on X and Y.
+        If predictions are batched, the score is computed from the batched
+        predictions (accuracy or R2, as the sklearn defaults), reusing Y_pred if given.
+        """
+        if not self._predict_options.get("predict_batch_size"):
+            return self.score([X, Y])
+        from sklearn.metrics import accuracy_score, r2_score  # type: ignore
+        if Y_pred is None:
+            Y_pred = self._predict_data(X)
+        if self._PLUGIN_MODULE_OPTIONS['Type'] == 'classification':
+            return accuracy_score(Y, Y_pred)
+        return r2_score(Y, Y_pred)
+
+    def _bind_model(self, model) -> None:
+        """Replaces the plugin model and rebinds the plugin methods to it"""
+        self.model = model
+        for attr in [a for a in vars(self) if a.endswith("_plugin")]:
+            method = attr[:-len("_plugin")]
+            if hasattr(model, method):
+                setattr(self, attr, getattr(model, method))
+
+    def _model_key(self) -> str:
+        from vai_lab.Modelling.model_store import config_hash
+        return config_hash(self._config["plugin_name"], self._config["options"])
+
+    def save(self, options={}):
+        """Stores the fitted model, keyed by module name and plugin configuration
+        :param options: dict with keys
+                    path: str, model store directory
+                    module [optional]: str, module name, defaults to this module
+        :returns: str, filename of the stored model
+        """
+        from vai_lab.Modelling.model_store import ModelStore
+        module = options.get("module", self._module_name)
+        return ModelStore(options["path"]).save(self.model, module, self._model_key())
+
+    def load(self, options={}):
+        """Replaces the model with a fitted model from a model store,
+        so predictions can be made without fitting
+        :param options: dict with keys
+                    path: str, model store directory
+                    module [optional]: str, module the model was fitted in,
+                                        defaults to this module
+                    mmap [optional]: bool, memory-map large arrays, default True
+        """
+        from vai_lab.Modelling.model_store import ModelStore
+        module = options.get("module", self._module_name)
+        try:
+            model = ModelStore(options["path"]).load(module,
+                                                     self._model_key(),
+                                                     options.get("mmap", True))
+        except Exception as exc:
+            print('The plugin encountered an error when loading the stored model of '
+                     +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
+            raise
+        self._bind_model(model)
+        self._loaded = True
+        return model
+
+    def _search_space(self, options: dict) -> Dict[str, list]:
+        """Candidate values of each searched option.
+        Options must be settings declared by the plugin. Plugins which declare
+        no settings accept any parameter of their model.
+        Values are given as lists or comma separated strings and are converted
+        to the declared type of the setting.
+        """
+        settings = {**self._PLUGIN_REQUIRED_SETTINGS, **self._PLUGIN_OPTIONAL_SETTINGS}
+        if len(settings) == 0:
+            settings = {key: None for key in self.model.get_params()}
+        invalid = [key for key in options if key not in settings]
+        if len(invalid) > 0:
+            print('The plugin '
+                     +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])
+                     +' cannot search the options: '+', '.join(invalid)+'.'
+                     +' Available options are: '+', '.join(settings)+'.')
+            raise ValueError("Invalid search options: {0}".format(invalid))
+        convert = {"int": int, "float": float, "str": str,
+                   "bool": lambda v: str(v).strip().lower() in ("true", "yes", "1")}
+        space = {}
+        for key, val in options.items():
+            if isinstance(val, str):
+                val = [v.strip() for v in val.split(",")]
+            elif not isinstance(val, (list, tuple)):
+                val = [val]
+            if settings[key] in convert:
+                val = [convert[settings[key]](v) for v in val]
+            space[key] = list(val)
+        return space
+
+    @instrumented
+    def search(self, options={}):
+        """Searches the plugin options for the best cross-validated score,
+        then replaces the model with the best model refitted on all data.
+        Folds and candidates are evaluated in parallel processes.
+        The best parameters, best score, all results and the best model are
+        written to the output data as best_params, best_score, cv_results and best_estimator.
+        :param options: dict with keys
+                    X, y: training data
+                    strategy [optional]: str, "grid" (default), "random",
+                            "halving" or "halving_random". Halving strategies
+                            evaluate all candidates on few samples and only keep
+                            the best ones for larger budgets
+                    cv [optional]: int, number of folds, default 5
+                    n_jobs [optional]: int, number of processes, default -1 (all CPUs)
+                    n_candidates [optional]: int, number of candidates of random search, default 10
+                    factor [optional]: int, fraction of candidates kept by halving, default 3
+                    scoring [optional]: str, sklearn scorer, default the score of the model
+                    seed [optional]: int, random seed of random and halving strategies
+                    any other key: candidate values of a plugin option
+        :returns: fitted sklearn search object
+        """
+        from sklearn.base import clone  # type: ignore
+        from sklearn import model_selection  # type: ignore
+        options = dict(options)
+        X = options.pop("X", self.X)
+        y = options.pop("y", options.pop("Y", self.Y))
+        if y is not None:
+            y = self._ravel(y)
+        strategy = str(options.pop("strategy", "grid")).lower()
+        common = {"cv": self._scalar(options.pop("cv", 5)),
+                  "n_jobs": self._scalar(options.pop("n_jobs", -1)),
+                  "scoring": options.pop("scoring", None),
+                  "refit": True}
+        n_candidates = self._scalar(options.pop("n_candidates", 10))
+        factor = self._scalar(options.pop("factor", 3))
+        seed = self._scalar(options.pop("seed", None))
+        space = self._search_space(options)
+
+        if strategy == "grid":
+            search = model_selection.GridSearchCV(clone(self.model), space, **common)
+        elif strategy == "random":
+            search = model_selection.RandomizedSearchCV(clone(self.model), space,
+                                                        n_iter=n_candidates,
+                                                        random_state=seed, **common)
+        elif strategy in ("halving", "halving_random"):
+            from sklearn.experimental import enable_halving_search_cv  # type: ignore  # noqa: F401
+            if strategy == "halving":
+                search = model_selection.HalvingGridSearchCV(clone(self.model), space,
+                                                             factor=factor,
+                                                             random_state=seed, **common)
+            else:
+                search = model_selection.HalvingRandomSearchCV(clone(self.model), space,
+                                                               factor=factor,
+                                                               random_state=seed, **common)
+        else:
+            print('Search strategy "{0}" not recognised. '.format(strategy)
+                  + 'Available strategies are: grid, random, halving, halving_random.')
+            raise ValueError("Invalid search strategy: {0}".format(strategy))
+
+        try:
+            search.fit(X, y)
+        except Exception as exc:
+            print('The plugin encountered an error when searching the options of '
+                     +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
+            raise
+        self._bind_model(search.best_estimator_)
+        self._search_results = {"best_params": search.best_params_,
+                                "best_score": search.best_score_,
+                                "cv_results": pd.DataFrame(search.cv_results_),
+                                "best_estimator": search.best_estimator_}
+        return search
+
+    @instrumented
     def fit(self, options={}):
         """Sends params to fit, then runs fit"""
         try:
@@ -253,6 +514,36 @@ class ModellingPluginT(PluginTemplate, ABC):
                      +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
             raise
 
+    @instrumented
+    def partial_fit(self, options={}):
+        """Sends params to partial_fit, then runs one incremental fitting step.
+        Options holding streams of chunks (e.g. data loaded with stream="true")
+        are iterated over together and partial_fit is called once per chunk,
+        so the data never needs to fit in memory.
+        """
+        try:
+            if isinstance(options, list):
+                return self.partial_fit_plugin(*options)
+            if isinstance(options, dict):
+                streams = {key: val for key, val in options.items()
+                           if isinstance(val, CSVChunkStream)}
+                if len(streams) == 0:
+                    return self.partial_fit_plugin(**options)
+                for chunks in zip(*streams.values()):
+                    chunk_options = {**options, **dict(zip(streams.keys(), chunks))}
+                    for key in chunk_options:
+                        if key.lower() == 'y':
+                            chunk_options[key] = np.asarray(chunk_options[key]).ravel()
+                    self.partial_fit_plugin(**chunk_options)
+                return self.model
+            else:
+                return self.partial_fit_plugin(options)
+        except Exception as exc:
+            print('The plugin encountered an error when incrementally fitting '
+                     +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
+            raise
+
+    @instrumented
     def predict(self, options={}):
         """Uses fitted model to predict output of a given Y
         :param data: array-like or sparse matrix, shape (n_samples, n_features)
@@ -274,6 +565,7 @@ class ModellingPluginT(PluginTemplate, ABC):
                      +str(list(self._PLUGIN_READABLE_NAMES.keys())[list(self._PLUGIN_READABLE_NAMES.values()).index('default')])+': '+str(exc)+'.')
             raise
 
+    @instrumented
     def score(self, options={}):
         """Return the coefficient of determination
         :param  X : array-like of shape (n_samples, n_features)
@@ -1,6 +1,8 @@
-from typing import Any, Protocol, KeysView, Dict, TypeVar
-from pandas.core.frame import DataFrame
-from tkinter.font import Font
+from typing import TYPE_CHECKING, Any, Protocol, KeysView, Dict, TypeVar
+
+if TYPE_CHECKING:
+    from pandas.core.frame import DataFrame
+    from tkinter.font import Font
 
 DataInterfaceT = TypeVar("DataInterfaceT", bound="DataInterface")
 DictT = Dict[str, Dict]
@@ -34,7 +36,10 @@ class DataInterface(Protocol):
     def copy(self: DataInterfaceT) -> DataInterfaceT:
         ...
 
-    def __getitem__(self, key: str) -> DataFrame:
+    def derive(self: DataInterfaceT) -> DataInterfaceT:
+        ...
+
+    def __getitem__(self, key: str) -> "DataFrame":
         ...
 
 
@@ -69,6 +74,9 @@ class EnvironmentPluginInterface(PluginInterface, Protocol):
     def run_simulation(self):
         ...
 
+    def _test(self, data: DataInterface) -> DataInterface:
+        ...
+
 
 class PluginSpecsInterface(Protocol):
     @property
@@ -129,7 +137,7 @@ class ModuleInterface(Protocol):
 
 class GUICoreInterface(ModuleInterface,Protocol):
     title: Any #mypy bug prevents proper typing
-    pages_font: Font
+    pages_font: "Font"
 
     def destroy(self) -> None:
         ...
@@ -4,6 +4,7 @@ or start a GUI if no config file given.
 """
 
 import argparse
+import sys
 from os.path import abspath
 
 import vai_lab as ai
@@ -27,27 +28,95 @@ def parse_args():
                         help='pipeline config file',                        
                         )
 
+    parser.add_argument(
+                        '--headless',
+                        action='store_true',
+                        help='run without the GUI progress tracker',
+                        )
+
+    parser.add_argument(
+                        '-w',
+                        '--workers',
+                        type=int,
+                        default=1,
+                        help='number of independent modules run concurrently (headless only)',
+                        )
+
+    parser.add_argument(
+                        '--cache-dir',
+                        type=str,
+                        default=None,
+                        help='directory used to cache module outputs across runs',
+                        )
+
+    parser.add_argument(
+                        '--fuse-processing',
+                        action='store_true',
+                        help='run chains of DataProcessing modules in one pass, '
+                             + 'which also transforms X_test',
+                        )
+
+    parser.add_argument(
+                        '--profile',
+                        type=str,
+                        default=None,
+                        help='record time, memory and data size of each module and write them '
+                             + 'to <PROFILE>.json and the Chrome trace <PROFILE>.trace.json',
+                        )
+
+    parser.add_argument(
+                        '--batch',
+                        action='store_true',
+                        help='run each config file as a separate pipeline and print a summary',
+                        )
+
+    parser.add_argument(
+                        '-p',
+                        '--processes',
+                        type=int,
+                        default=1,
+                        help='number of config files run concurrently with --batch (headless)',
+                        )
+
     args = parser.parse_args()
 
+    if args.batch and args.profile:
+        parser.error('--profile cannot be combined with --batch, '
+                     + 'profile the config files one at a time')
+
     return args
 
-def _config_files_iter(core,files):
-    """Iterate over config files and load them into core
-    TODO: WIP - need a reset function to avoid instantiating core every time
-    """
-    if files:
-        for f in files:
-            core = ai.Core()
-            core.load_config_file(abspath(f))
-            core.run()
+def _run_batch(args):
+    """Runs each config file with one resettable Core per process"""
+    from vai_lab.Core.batch_runner import BatchRunner
+    runner = BatchRunner(headless=args.headless or args.processes > 1,
+                         processes=args.processes,
+                         max_workers=args.workers,
+                         cache_dir=args.cache_dir,
+                         fuse_processing=args.fuse_processing)
+    results = runner.run(args.file)
+    print(runner.summary(results))
+    if any(r["status"] != "ok" for r in results):
+        sys.exit(1)
 
 def main():
 
     # Parse command line arguments
     args = parse_args()
 
+    if args.batch and args.file:
+        return _run_batch(args)
+
     # Core instance
-    core = ai.Core()
+    core = ai.Core(headless=args.headless,
+                   max_workers=args.workers,
+                   fuse_processing=args.fuse_processing)
+
+    if args.cache_dir:
+        core.enable_result_cache(abspath(args.cache_dir))
+
+    if args.profile:
+        core.enable_instrumentation(trace_memory=True)
 
     # Load config file if given
     if args.file:
@@ -57,5 +126,9 @@ def main():
     # Run pipeline
     core.run()
 
+    if args.profile:
+        core.instrumentation.to_json(abspath(args.profile) + ".json")
+        core.instrumentation.to_chrome_trace(abspath(args.profile) + ".trace.json")
+
 if __name__=='__main__':
     main()
\ No newline at end of file
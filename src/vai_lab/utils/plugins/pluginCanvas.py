@@ -349,7 +349,7 @@ class pluginCanvas(tk.Frame):
         """
         module = np.array(self.module_list)[self.m == np.array(self.id_mod)][0]
         name = self.canvas.itemcget('t'+str(self.m), 'text')
-        ps = PluginSpecs()
+        ps = PluginSpecs.shared()
         plugin_list = list(ps.class_names[module].values())
         plugin_list.append('Custom')
         descriptions = list(ps.class_descriptions[module].values())
@@ -494,7 +494,7 @@ class pluginCanvas(tk.Frame):
         of the selected plugin."""
 
         module = np.array(self.module_list)[self.m == np.array(self.id_mod)][0]
-        ps = PluginSpecs()
+        ps = PluginSpecs.shared()
         file_name = os.path.split(ps.find_from_class_name(self.plugin[self.m].get())['_PLUGIN_DIR'])[-1]
         avail_plugins = ps.available_plugins[module][file_name]
         plugin = import_plugin_absolute(globals(),
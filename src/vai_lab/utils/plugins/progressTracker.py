@@ -1,4 +1,6 @@
 import os
+import queue
+import time
 import tkinter as tk
 from typing import Dict
 from tkinter import ttk
@@ -63,12 +65,12 @@ class progressTracker(tk.Frame):
         """
         self.canvas.bind('<Button-1>', self.on_click)
         self.dataType: Dict = {}
+        self._boxes: Dict = {}
+        self._tooltips: Dict = {}
         
-        sec = 5
         self.click = False
         self.my_label = tk.Label(frame2, 
-                    text = 
-                    'This window will get\nclosed after '+str(sec)+' seconds\nunless you click on the canvas.',
+                    text = 'Running pipeline...',
                     pady= 10,
                     font = self.controller.title_font,
                     bg = self.bg,
@@ -80,7 +82,7 @@ class progressTracker(tk.Frame):
         self.upload()
 
         tk.Button(
-            self.frame4, text = 'Next step', fg = 'white', bg = parent['bg'], 
+            self.frame4, text = 'Close', fg = 'white', bg = parent['bg'], 
             height = 3, width = 15, font = self.controller.pages_font, 
             command = self.check_quit).grid(column = 1, row = 26, sticky="news", pady=(0,10))
         """
@@ -102,22 +104,62 @@ class progressTracker(tk.Frame):
         frame3.grid_columnconfigure(tuple(range(2)), weight=1)
         self.frame4.grid_columnconfigure(tuple(range(2)), weight=1)
 
-        self._job = self.controller.after(sec*1000, self.check_quit)
+        self._events = getattr(self.controller, '_events', None)
+        self._control = getattr(self.controller, '_control', None)
+        self._job = None
+        if self._events is not None:
+            self._job = self.controller.after(200, self.poll_events)
 
     def on_click(self, event):
         """ Passes the mouse click coordinates to the select function."""
-        self.cancel_timer()
         self.select(event.x, event.y)
-    
-    def cancel_timer(self):
-        """ Cancels the timer set to close the window. """
-        if self._job is not None:
-            self.controller.after_cancel(self._job)
-            self._job = None
+
+    def poll_events(self):
+        """ Applies the progress events published by the pipeline since the
+        last poll and schedules the next poll. Never waits for events."""
+        try:
+            while True:
+                self.apply_event(self._events.get_nowait())
+        except queue.Empty:
+            pass
+        self._job = self.controller.after(200, self.poll_events)
+
+    def apply_event(self, event: dict):
+        """ Updates the status and colour of a module from a progress event. """
+        if event['event'] == 'pipeline_finish':
+            self.my_label.config(text = 'Pipeline complete')
+            return
+        if event['event'] not in ('start', 'finish'):
+            return
+        status = self.controller._status.setdefault(event['name'], {})
+        status[event['event']] = time.strftime('%H:%M:%S', time.localtime(event['time']))
+        if event['event'] == 'start':
+            for key in ('finish', 'duration', 'data size'):
+                status.pop(key, None)
+        else:
+            status['duration'] = '{:.2f} s'.format(event['duration'])
+            if 'data_size' in event:
+                status['data size'] = '{:.1f} MB'.format(event['data_size']/2**20)
+        if event['name'] in self._boxes:
+            self.canvas.itemconfig('p'+str(self._boxes[event['name']]),
+                                   fill = self.status_colour(event['name']))
+            for tooltip in self._tooltips[event['name']]:
+                tooltip.text = 'Model progress status:\n'+self.pretty_status(status)
+
+    def status_colour(self, boxName: str):
+        """ Green if the module finished, orange if it is running. """
+        if 'start' in self.controller._status.get(boxName, {}):
+            if 'finish' in self.controller._status[boxName]:
+                return '#46da63'
+            else:
+                return '#dbaa21'
+        return self.bg
 
     def terminate(self):
-        """ Terminates window and pipeline. """
+        """ Requests the pipeline to stop and closes the window. """
         self.controller._append_to_output('terminate', True)
+        if self._control is not None:
+            self._control.put('terminate')
         self.check_quit()
         
     def select(self, x: float, y:float):
@@ -187,14 +229,8 @@ class progressTracker(tk.Frame):
         else:  # Make initialisation and output unmoveable
             tag = ('n0',)
         text_w = self.controller.pages_font.measure(boxName+'-00') + 10
-        # Check module status
-        if 'start' in self.controller._status[boxName]:
-            if 'finish' in self.controller._status[boxName]:
-                colour = '#46da63'
-            else:
-                colour = '#dbaa21'
-        else:
-            colour = self.bg
+        colour = self.status_colour(boxName)
+        self._boxes[boxName] = self.modules
         
         self.canvas.create_rectangle(
             x - text_w/2 , 
@@ -216,10 +252,12 @@ class progressTracker(tk.Frame):
             fill = '#d0d4d9', 
             justify = tk.CENTER)
         
-        CanvasTooltip(self.canvas, self.canvas.find_withtag('p'+str(self.modules))[0], 
-                           text = 'Model progress status:\n'+self.pretty_status(self.controller._status[boxName])) # Link box
-        CanvasTooltip(self.canvas, self.canvas.find_withtag('t'+str(self.modules))[0], 
-                           text = 'Model progress status:\n'+self.pretty_status(self.controller._status[boxName])) # Link text
+        status = self.controller._status.get(boxName, {})
+        self._tooltips[boxName] = [
+            CanvasTooltip(self.canvas, self.canvas.find_withtag('p'+str(self.modules))[0], 
+                           text = 'Model progress status:\n'+self.pretty_status(status)), # Link box
+            CanvasTooltip(self.canvas, self.canvas.find_withtag('t'+str(self.modules))[0], 
+                           text = 'Model progress status:\n'+self.pretty_status(status))] # Link text
         
         if not out:
             self.canvas.create_oval(
@@ -273,7 +311,7 @@ class progressTracker(tk.Frame):
         self.mt = self.m -1 if self.m < len(self.module_list)-1 else  1
 
         module = np.array(self.module_list)[self.mt == np.array(self.id_mod)][0]
-        ps = PluginSpecs()
+        ps = PluginSpecs.shared()
         file_name = os.path.split(ps.find_from_class_name(self.plugin_list[self.m])['_PLUGIN_DIR'])[-1]
         avail_plugins = ps.available_plugins[module][file_name]
         plugin = import_plugin_absolute(globals(),
@@ -836,7 +874,6 @@ class progressTracker(tk.Frame):
             self.m = self.id_mod[2]
 
         else: # There are no coordinates for some modules.
-            self.my_label.config(text = " ".join(self.my_label.cget('text').split(' ')[:-1] + ['list.']))
 
             self.update_output(modules)
             self.id_mod = list(range(len(self.module_list)))
@@ -864,7 +901,6 @@ class progressTracker(tk.Frame):
 
     def on_click_noCanvas(self, event):
         """ Passes the mouse click coordinates to the select function when there is no Canvas."""
-        self.cancel_timer()
         self.select_noCanvas(event.x, event.y)
         
     def select_noCanvas(self, x: float, y:float):
@@ -994,6 +1030,8 @@ class progressTracker(tk.Frame):
             self.newWindow.destroy()
         
         self.canvas_startxy = []
+        self._boxes = {}
+        self._tooltips = {}
         self.out_data = pd.DataFrame()
         self.connections = {}
         self.modules = 0
@@ -1010,6 +1048,9 @@ class progressTracker(tk.Frame):
         self.plugin = {}
 
     def check_quit(self):
+        if self._job is not None:
+            self.controller.after_cancel(self._job)
+            self._job = None
         self.controller.destroy()
 
 class CanvasTooltip:
@@ -0,0 +1,11 @@
+"""
+Shared fixtures of the tests
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps plugin spec and plan caches out of the user's cache directory"""
+    monkeypatch.setenv("VAI_LAB_CACHE_DIR", str(tmp_path / "vai_lab_cache"))
+    return tmp_path / "vai_lab_cache"
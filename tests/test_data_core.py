@@ -0,0 +1,88 @@
+"""
+Tests for vai_lab.Data.Data_core.py
+"""
+from os import path
+
+from vai_lab.Data.Data_core import Data
+from vai_lab._import_helper import get_lib_parent_dir
+
+_EXAMPLES = path.join(get_lib_parent_dir(), "examples")
+
+
+def test_data_derive():
+    data = Data()
+    data.import_data(path.join(_EXAMPLES, "supervised_regression", "X_tr.csv"), "X")
+    derived = data.derive()
+    assert derived["X"] is data["X"]
+
+    derived.append_data_column("Y_pred", [1, 2, 3])
+    derived.append_data_column("X", None)
+
+    assert "Y_pred" not in data.keys()
+    assert data["X"] is not None
+    assert derived["X"] is None
+    assert set(derived.keys()) == {"X", "Y_pred"}
+    data.append_data_column("Y", [0])
+    assert "Y" not in derived.keys()
+
+
+def test_data_import_csv_mmap(tmp_path):
+    import shutil
+    import numpy as np
+    filename = tmp_path / "X_tr.csv"
+    shutil.copy(path.join(_EXAMPLES, "supervised_regression", "X_tr.csv"), filename)
+
+    data = Data()
+    data.import_data(str(filename), "X")
+    for _ in range(2):
+        data.import_data(str(filename), "X_mmap", storage="mmap")
+        assert (tmp_path / "X_tr.csv.columns" / "meta.json").exists()
+        assert list(data["X_mmap"].columns) == list(data["X"].columns)
+        assert np.allclose(data["X_mmap"].to_numpy(), data["X"].to_numpy())
+        assert isinstance(data["X_mmap"].iloc[:, 0].values, np.memmap)
+
+
+def test_data_import_dir_lazy():
+    from vai_lab.Data.image_store import LazyImageDict
+    folder = path.join(_EXAMPLES, "image_classification", "training_images")
+    data = Data()
+    data.import_data(folder, "X", workers=4)
+    data.import_data(folder, "X_lazy", lazy=True, cache_size=2)
+
+    assert isinstance(data["X_lazy"], LazyImageDict)
+    assert list(data["X_lazy"].keys()) == list(data["X"].keys())
+    for key in data["X"].keys():
+        assert (data["X_lazy"][key] == data["X"][key]).all()
+    assert len(data["X_lazy"]._cache) == 2
+
+
+def test_data_import_csv_chunked(tmp_path):
+    import numpy as np
+    import pandas as pd
+    filename = tmp_path / "sensors.csv"
+    pd.DataFrame({"value": np.linspace(0, 1, 1000),
+                  "count": np.arange(1000),
+                  "sensor": ["a", "b", "c", "d"] * 250}).to_csv(filename, index=False)
+
+    data = Data()
+    data.import_data(str(filename), "X", chunksize=300, downcast=True, categorical=0.1)
+    assert data["X"]["value"].dtype == np.float32
+    assert data["X"]["count"].dtype == np.int16
+    assert isinstance(data["X"]["sensor"].dtype, pd.CategoricalDtype)
+    assert len(data["X"]) == 1000
+
+    data.import_data(str(filename), "X_stream", chunksize=300, stream=True)
+    assert [len(chunk) for chunk in data["X_stream"]] == [300, 300, 300, 100]
+
+
+def test_data_import_npz(tmp_path):
+    from scipy import sparse
+    from vai_lab.Data.Data_core import is_sparse
+    matrix = sparse.random(100, 1000, density=0.01, format="csr", random_state=0)
+    sparse.save_npz(tmp_path / "X.npz", matrix)
+    data = Data()
+    data.import_data(str(tmp_path / "X.npz"), "X")
+
+    assert is_sparse(data["X"])
+    assert (data["X"] != matrix).nnz == 0
+    assert not is_sparse(matrix.toarray())
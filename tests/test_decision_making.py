@@ -0,0 +1,50 @@
+"""
+Tests for vai_lab.DecisionMaking
+"""
+import numpy as np
+
+from vai_lab.Data.Data_core import Data
+
+
+def _bo_data(n=8, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-2, 2, size=(n, 2))
+    data = Data()
+    data.append_data_column("X", X)
+    data.append_data_column("Y", np.sum((X - 0.5)**2, axis=1))
+    return data
+
+
+def _bo_config(**options):
+    return {"plugin_name": "BayesianOptimisation",
+            "options": {"bounds": "[(-2, 2), (-2, 2)]", "random_state": "0",
+                        "n_candidates": "500", **options},
+            "methods": {"_order": []}}
+
+
+def test_bayesian_optimisation_batch():
+    from vai_lab.DecisionMaking.plugins.bayesianoptimisation import BayesianOptimisation
+    data = _bo_data()
+    for method in ("local_penalisation", "kriging_believer"):
+        plugin = BayesianOptimisation(_bo_config(batch_size="4", batch_method=method), data)
+        batch = plugin.suggest_next_locations()
+
+        assert batch.shape == (4, 2)
+        assert (np.abs(batch) <= 2).all()
+        # Points of a batch are distinct
+        dist = np.linalg.norm(batch[:, None] - batch[None], axis=-1)
+        assert dist[np.triu_indices(4, 1)].min() > 1e-3
+
+
+def test_decision_making_module():
+    from vai_lab.DecisionMaking.DecisionMaking_core import DecisionMaking
+    from vai_lab._plugin_helpers import PluginSpecs
+    data = _bo_data()
+    module = DecisionMaking()
+    module.set_avail_plugins(PluginSpecs())
+    module.set_options({"plugin": _bo_config(acquisition="UCB", batch_size="3")})
+    module._load_plugin(data)
+    module.launch()
+
+    assert module.get_result()["X_suggest"].shape == (3, 2)
+    assert "X_suggest" not in data.keys()
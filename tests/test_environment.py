@@ -0,0 +1,74 @@
+"""
+Tests for vai_lab.Environment
+"""
+from os import path
+import time
+
+import numpy as np
+
+from vai_lab.Data.Data_core import Data
+from vai_lab.Data.xml_handler import XML_handler
+from vai_lab._import_helper import get_lib_parent_dir
+
+
+def _pybullet_config(**options):
+    xml_handler = XML_handler()
+    xml_handler.load_XML(path.join(get_lib_parent_dir(), "examples", "xml_files",
+                                   "pybullet_env_example.xml"))
+    config = xml_handler.loaded_modules["MyEnv"]["plugin"]
+    config["options"].update(options)
+    return config
+
+
+def test_pybullet_num_envs():
+    from vai_lab.Environment.plugins.PyBulletEnv import PyBulletEnv
+    env = PyBulletEnv(_pybullet_config(num_envs=3, headless=True), Data())
+    env.connect()
+    env.load_model()
+    n_joints = sum(len(env._joints(body)) for body in env._bodies)
+    actions = np.zeros((3, n_joints))
+    actions[0] = 1.
+    obs = env.step(actions)
+
+    assert obs.shape[0] == 3
+    assert np.allclose(obs[1], obs[2])
+    assert not np.allclose(obs[0], obs[1])
+    env.disconnect()
+
+
+def test_pybullet_headless_no_sleep():
+    from vai_lab.Environment.plugins.PyBulletEnv import PyBulletEnv
+    env = PyBulletEnv(_pybullet_config(max_steps=200, timestep=0.01, headless=True), Data())
+    env.connect()
+    env.load_model()
+    start = time.perf_counter()
+    env.run_simulation()
+
+    assert time.perf_counter() - start < 2.
+    assert env.clients == []
+
+
+def test_pybullet_rollouts():
+    from vai_lab.Environment.plugins.PyBulletEnv import PyBulletEnv
+    env = PyBulletEnv(_pybullet_config(num_envs=2, max_steps=31, buffer_size=20,
+                                       random_torque=1., headless=True), Data())
+    env.connect()
+    env.load_model()
+    env.run_simulation()
+    out = env._test(Data())
+
+    n_obs, n_act = out["states"].shape[2], out["actions"].shape[2]
+    assert out["states"].shape == (20, 2, n_obs)
+    assert out["rewards"].shape == (20, 2)
+    assert out["X"].shape == (40, n_obs + n_act)
+    assert list(out["X"].columns[[0, n_obs]]) == ["State_0", "Action_0"]
+    assert out["Y"].columns == ["Reward"]
+    assert np.abs(out["actions"]).max() > 0
+
+
+def test_rollout_buffer_wraps():
+    from vai_lab.Environment.rollout_buffer import RolloutBuffer
+    buffer = RolloutBuffer(3, 1, 1, 1)
+    for step in range(5):
+        buffer.append([[step]], [[-step]], [step])
+    assert buffer.to_dict()["states"].ravel().tolist() == [2, 3, 4]
@@ -0,0 +1,86 @@
+"""
+Tests for vai_lab.Data.pipeline_plan
+"""
+from os import path
+
+import pytest
+
+from vai_lab._import_helper import get_lib_parent_dir
+from vai_lab.Data import pipeline_plan
+from vai_lab.Data.pipeline_plan import PipelinePlanError, load_plan
+
+
+def _config(tmp_path, replace=("", "")):
+    example = path.join(get_lib_parent_dir(), "examples", "xml_files", "ridge-scalar-ridge_demo.xml")
+    with open(example) as f:
+        config = f.read().replace(*replace)
+    filename = tmp_path / "config.xml"
+    filename.write_text(config)
+    return str(filename)
+
+
+def test_pipeline_plan(tmp_path, monkeypatch):
+    monkeypatch.setenv("VAI_LAB_CACHE_DIR", str(tmp_path / "cache"))
+    filename = _config(tmp_path)
+    plan = load_plan(filename)
+
+    assert plan.order == ("Initialiser", "Modelling", "Data Processing", "Modelling-1", "Output")
+    assert plan.plugins["Data Processing"]["class_name"] == "StandardScaler"
+    assert all(path.isabs(p) for p in plan.data_paths())
+    with pytest.raises(AttributeError):
+        plan.order = []
+    with pytest.raises(TypeError):
+        plan.modules["Output"] = {}
+    with pytest.raises(TypeError):
+        plan.plugins["Output"] = {}
+    copy = plan.copy_modules()
+    copy["Modelling"]["plugin"]["options"]["alpha"] = 1
+    assert plan.modules["Modelling"]["plugin"]["options"]["alpha"] == 1e-3
+
+    def no_compile(*args):
+        raise AssertionError("config compiled although its plan is cached")
+    with monkeypatch.context() as m:
+        m.setattr(pipeline_plan, "compile_plan", no_compile)
+        assert dict(load_plan(filename).modules) == dict(plan.modules)
+
+    _config(tmp_path, ("1e-3", "0.5"))
+    changed = load_plan(filename)
+    assert changed.file_hash != plan.file_hash
+    assert changed.modules["Modelling"]["plugin"]["options"]["alpha"] == 0.5
+
+
+def test_pipeline_plan_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("VAI_LAB_CACHE_DIR", str(tmp_path / "cache"))
+    with pytest.raises(PipelinePlanError, match="plugin \"NoSuchPlugin\" not found"):
+        load_plan(_config(tmp_path, ('type="StandardScaler"', 'type="NoSuchPlugin"')))
+    with pytest.raises(PipelinePlanError, match="unknown parent"):
+        load_plan(_config(tmp_path, ('<parent name="Modelling" />', '<parent name="Nowhere" />')))
+
+
+def test_core_uses_plan(tmp_path, monkeypatch):
+    from vai_lab import Core
+    from vai_lab._plugin_helpers import PluginSpecs
+    monkeypatch.setenv("VAI_LAB_CACHE_DIR", str(tmp_path / "cache"))
+    # The Modelling module is declared after the Data Processing module it feeds
+    example = path.join(get_lib_parent_dir(), "examples", "xml_files", "ridge-scalar-ridge_demo.xml")
+    with open(example) as f:
+        config = f.read()
+    start, end = config.index("    <Modelling name=\"Modelling\">"), config.index("    <DataProcessing")
+    config = config[:start] + config[end:config.index("    <Modelling name=\"Modelling-1\">")] \
+        + config[start:end] + config[config.index("    <Modelling name=\"Modelling-1\">"):]
+    config = config.replace(r".\examples\results\output.pkl", str(tmp_path / "output.pkl"))
+    filename = tmp_path / "config.xml"
+    filename.write_text(config)
+
+    core = Core(headless=True)
+    core.load_config_file(str(filename))
+    order = []
+    core.subscribe(lambda event: order.append(event["name"]) if event["event"] == "start" else None)
+
+    def no_lookup(*args):
+        raise AssertionError("plugin looked up in the registry although the plan resolved it")
+    monkeypatch.setattr(PluginSpecs, "find_from_readable_name", no_lookup)
+    core.run()
+
+    assert order == list(core.plan.order)
+    assert list(core._xml_handler.loaded_modules)[1] == "Data Processing"
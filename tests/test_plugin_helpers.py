@@ -0,0 +1,46 @@
+"""
+Tests for vai_lab._plugin_helpers
+"""
+import pickle
+
+import pytest
+
+from vai_lab._plugin_helpers import PluginSpecs
+
+
+def _no_parse(self):
+    raise AssertionError("plugin files parsed although the cache is valid")
+
+
+def _edit_cache(ps, edit):
+    with open(ps._cache_file(), "rb") as f:
+        cache = pickle.load(f)
+    filename = sorted(cache["files"])[0]
+    cache["files"][filename] = edit(*cache["files"][filename])
+    with open(ps._cache_file(), "wb") as f:
+        pickle.dump(cache, f)
+
+
+def test_plugin_specs_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("VAI_LAB_CACHE_DIR", str(tmp_path))
+    ps = PluginSpecs()
+    assert ps.available_plugins == PluginSpecs(use_cache=False).available_plugins
+
+    with monkeypatch.context() as m:
+        m.setattr(PluginSpecs, "_get_plugin_specs", _no_parse)
+        assert PluginSpecs().available_plugins == ps.available_plugins
+        # A new modification time alone does not invalidate the cache
+        _edit_cache(ps, lambda mtime, size, sha1: (mtime - 1, size, sha1))
+        assert PluginSpecs().available_plugins == ps.available_plugins
+
+        _edit_cache(ps, lambda mtime, size, sha1: (mtime - 1, size, "0"*40))
+        with pytest.raises(AssertionError):
+            PluginSpecs()
+    assert PluginSpecs().available_plugins == ps.available_plugins
+
+
+def test_plugin_specs_shared():
+    ps = PluginSpecs.shared()
+    assert PluginSpecs.shared() is ps
+    ps._stats = {}
+    assert PluginSpecs.shared() is not ps
@@ -0,0 +1,158 @@
+"""
+Tests for vai_lab._plugin_templates.py
+"""
+from os import path
+
+import numpy as np
+
+from vai_lab.Data.Data_core import Data
+from vai_lab._import_helper import get_lib_parent_dir
+
+_EXAMPLES = path.join(get_lib_parent_dir(), "examples")
+
+
+def _plugin_config(options={}, methods={}, plugin_name=""):
+    config = {"plugin_name": plugin_name,
+              "options": dict(options),
+              "methods": {"_order": list(methods)}}
+    for method, method_options in methods.items():
+        config["methods"][method] = {"options": dict(method_options)}
+    return config
+
+
+def _classification_data(**options):
+    data = Data()
+    for name, f in (("X", "X_tr.csv"), ("Y", "Y_tr.csv"),
+                    ("X_test", "X_tst.csv"), ("Y_test", "Y_tst.csv")):
+        data.import_data(path.join(_EXAMPLES, "supervised_classification", f),
+                         name, **(options if name in ("X", "Y") else {}))
+    return data
+
+
+def test_partial_fit_stream():
+    from vai_lab.Modelling.plugins.perceptron import Perceptron
+    data = _classification_data(chunksize=20, stream=True)
+    methods = {"partial_fit": {"X": "X", "y": "Y", "classes": [0, 1]}}
+    plugin = Perceptron(_plugin_config({"random_state": 0}, methods), data)
+    plugin.partial_fit(plugin._parse_options_dict(dict(methods["partial_fit"])))
+
+    assert plugin.model.t_ == 61
+    out = plugin._test(data.derive())
+    assert out["Y_pred"].shape == (40,)
+
+
+def test_kmeans_partial_fit():
+    from sklearn.cluster import MiniBatchKMeans
+    from vai_lab.Modelling.plugins.kmeans import KMeans
+    data = _classification_data()
+    methods = {"partial_fit": {"X": "X"}}
+    plugin = KMeans(_plugin_config({"n_clusters": 2, "n_init": 1, "algorithm": "lloyd"}, methods),
+                    data)
+    plugin.partial_fit(plugin._parse_options_dict(dict(methods["partial_fit"])))
+
+    assert isinstance(plugin.model, MiniBatchKMeans)
+    assert np.unique(plugin.predict(data["X_test"])).size <= 2
+    full = KMeans(_plugin_config({"n_clusters": 2}, {"fit": {"X": "X"}}), data)
+    assert not hasattr(full, "partial_fit_plugin")
+
+
+def test_model_store(tmp_path):
+    from vai_lab.Modelling.plugins.randomforestclassifier import RandomForestClassifier
+    data = _classification_data()
+    options = {"n_estimators": 5, "random_state": 0}
+    fitted = RandomForestClassifier(_plugin_config(options, plugin_name="RandomForestClassifier"), data)
+    fitted._module_name = "Modelling"
+    fitted.fit([data["X"], np.ravel(data["Y"])])
+    fitted.save({"path": str(tmp_path)})
+
+    loaded = RandomForestClassifier(_plugin_config(options, plugin_name="RandomForestClassifier"), data)
+    loaded.load({"path": str(tmp_path), "module": "Modelling"})
+    assert (loaded.predict(data["X_test"]) == fitted.predict(data["X_test"])).all()
+    assert loaded.predict_proba(data["X_test"]).shape == (40, 2)
+
+
+def test_predict_batched():
+    from vai_lab.Modelling.plugins.randomforestclassifier import RandomForestClassifier
+    data = _classification_data()
+    options = {"n_estimators": 5, "random_state": 0,
+               "predict_batch_size": "7", "predict_n_jobs": "2", "train_score": "false"}
+    plugin = RandomForestClassifier(_plugin_config(options), data)
+    assert plugin._predict_options == {"predict_batch_size": 7, "predict_n_jobs": 2,
+                                       "train_score": False}
+    plugin.fit([data["X"], np.ravel(data["Y"])])
+
+    batched = plugin.predict_batched(data["X_test"], 7, n_jobs=2)
+    assert (batched == plugin.predict(data["X_test"])).all()
+    proba = plugin.predict_batched(data["X_test"], 7, method="predict_proba")
+    assert np.allclose(proba, plugin.predict_proba(data["X_test"]))
+    out = plugin._test(data.derive())
+    assert (out["Y_pred"] == batched).all()
+
+
+def _regression_data():
+    data = Data()
+    for name, f in (("X", "X_tr.csv"), ("Y", "Y_tr.csv"),
+                    ("X_test", "X_tst.csv"), ("Y_test", "Y_tst.csv")):
+        data.import_data(path.join(_EXAMPLES, "supervised_regression", f), name)
+    return data
+
+
+def test_search():
+    import pytest
+    from vai_lab.Modelling.plugins.svr import SVR
+    data = _regression_data()
+    plugin = SVR(_plugin_config(), data)
+    options = plugin._parse_options_dict({"X": "X", "y": "Y", "C": "0.1,1,10",
+                                          "kernel": "rbf, linear", "cv": "3", "n_jobs": "2"})
+    search = plugin.search(options)
+
+    assert len(search.cv_results_["params"]) == 6
+    assert plugin.model is search.best_estimator_
+    assert plugin.predict_plugin == search.best_estimator_.predict
+    out = plugin._test(data.derive())
+    assert set(out["best_params"]) == {"C", "kernel"}
+    assert out["cv_results"].shape[0] == 6
+
+    halving = plugin.search({"X": data["X"], "y": data["Y"], "C": [0.1, 1, 10, 100],
+                             "strategy": "halving", "cv": 3, "n_jobs": 1})
+    assert halving.n_iterations_ >= 2
+    with pytest.raises(ValueError):
+        plugin.search({"X": data["X"], "y": data["Y"], "epsilon": [0.1, 0.2]})
+
+
+def test_sparse_pass_through():
+    from scipy import sparse
+    from vai_lab.Core.events import data_nbytes
+    from vai_lab.Data.result_cache import data_fingerprint
+    from vai_lab.DataProcessing.DataProcessing_core import DataProcessing
+    from vai_lab.Modelling.plugins.logisticregression import LogisticRegression
+    from vai_lab._plugin_helpers import PluginSpecs
+    rng = np.random.default_rng(0)
+    categories = rng.integers(0, 500, (200, 1))
+    data = Data()
+    data.append_data_column("X", categories)
+    data.append_data_column("Y", (categories[:, 0] % 2).reshape(-1, 1))
+
+    module = DataProcessing()
+    module.set_avail_plugins(PluginSpecs.shared())
+    module.set_options({"plugin": _plugin_config({"handle_unknown": "ignore"},
+                                                 {"fit": {"X": "X"}, "transform": {"X": "X"}},
+                                                 "OneHotEncoder")})
+    module._load_plugin(data)
+    module.launch()
+    encoded = module.get_result()
+
+    assert sparse.issparse(encoded["X"]) and encoded["X"].shape[0] == 200
+    assert data_nbytes(encoded["X"]) < encoded["X"].shape[0] * encoded["X"].shape[1]
+    assert data_fingerprint(encoded) != data_fingerprint(data)
+    coo = encoded.derive()
+    coo.append_data_column("X", encoded["X"].tocoo())
+    assert data_fingerprint(coo) == data_fingerprint(encoded)
+
+    encoded.append_data_column("X_test", encoded["X"][:50])
+    encoded.append_data_column("Y_test", data["Y"][:50])
+    methods = {"fit": {"X": "X", "y": "Y"}}
+    plugin = LogisticRegression(_plugin_config({}, methods), encoded)
+    plugin.fit(plugin._parse_options_dict(dict(methods["fit"])))
+    out = plugin._test(encoded.derive())
+    assert out["Y_pred"].shape == (50,)
@@ -1,11 +1,344 @@
 """
 Tests for vai_lab.Core.vai_lab_core.py
 """
+from os import path
+import pickle
 
 from vai_lab import Core
+from vai_lab._import_helper import get_lib_parent_dir
+
+
+def _example_config(tmp_path, name):
+    """Copy an example config, redirecting its output to tmp_path"""
+    example = path.join(get_lib_parent_dir(), "examples", "xml_files", name)
+    with open(example) as f:
+        config = f.read()
+    outpath = tmp_path / "output.pkl"
+    config = config.replace(r".\examples\results\output.pkl", str(outpath))
+    filename = tmp_path / name
+    filename.write_text(config)
+    return str(filename), outpath
+
 
 def test_core_init():
 
     core = Core()
 
     assert core
+
+
+def test_core_headless(tmp_path):
+    filename, outpath = _example_config(tmp_path, "ridge-scalar-ridge_demo.xml")
+    core = Core(headless=True)
+    core.load_config_file(filename)
+    core.run()
+
+    with open(outpath, "rb") as f:
+        out = pickle.load(f)
+    assert set(out.keys()) == {"Modelling", "Modelling-1"}
+    assert "Y_pred" in out["Modelling-1"].keys()
+
+
+def test_core_dependency_graph(tmp_path):
+    filename, _ = _example_config(tmp_path, "ridge-scalar-ridge_demo.xml")
+    core = Core(headless=True)
+    core.load_config_file(filename)
+    graph = core._dependency_graph(core._xml_handler.loaded_modules)
+
+    assert graph == {"Initialiser": set(),
+                     "Modelling": {"Initialiser"},
+                     "Data Processing": {"Modelling"},
+                     "Modelling-1": {"Data Processing"},
+                     "Output": {"Modelling", "Modelling-1"}}
+
+
+def test_core_concurrent(tmp_path):
+    filename, outpath = _example_config(tmp_path, "ridge-scalar-ridge_demo.xml")
+    core = Core(headless=True, max_workers=4)
+    core.load_config_file(filename)
+    core.run()
+
+    assert outpath.exists()
+    assert all("finish" in status for status in core.status_logger.values())
+
+
+def test_core_concurrent_nested_dependency(tmp_path):
+    filename, outpath = _example_config(tmp_path, "ridge_regression_demo.xml")
+    with open(filename) as f:
+        config = f.read()
+    config = config.replace('<Modelling name="Modelling">',
+                            '<loop type="for" condition="3" name="loop0">'
+                            + '<Modelling name="Modelling">')
+    config = config.replace("</Modelling>", "</Modelling></loop>")
+    with open(filename, "w") as f:
+        f.write(config)
+    core = Core(headless=True, max_workers=4)
+    core.load_config_file(filename)
+    specs = core._xml_handler.loaded_modules
+
+    # Output reads Modelling, which is provided by loop0
+    assert core._dependency_graph(specs)["Output"] == {"loop0"}
+    core.run()
+    with open(outpath, "rb") as f:
+        out = pickle.load(f)
+    assert "Modelling" in out
+
+
+def test_core_concurrent_loops():
+    import time
+    core = Core(headless=True, max_workers=2)
+    specs = {name: {"name": name, "class": "loop", "type": "for", "condition": "3",
+                    "parents": [],
+                    name + "_module": {"name": name + "_module", "class": "module",
+                                       "parents": []}}
+             for name in ("loop0", "loop1")}
+    levels = []
+
+    def record_level(module_specs):
+        levels.append(core.loop_level)
+        time.sleep(0.01)
+    core._execute_module = record_level
+    core._init_status(specs)
+    core._execute(specs)
+
+    # Sibling loops run concurrently without changing each other's nesting level
+    assert levels == [1] * 6
+    assert core.loop_level == 0
+
+
+def test_core_result_cache(tmp_path, capsys):
+    filename, outpath = _example_config(tmp_path, "ridge-scalar-ridge_demo.xml")
+    for _ in range(2):
+        core = Core(headless=True)
+        core.enable_result_cache(str(tmp_path / "cache"))
+        core.load_config_file(filename)
+        core.run()
+
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 3
+    assert capsys.readouterr().out.count("loaded from cache") == 3
+    with open(outpath, "rb") as f:
+        out = pickle.load(f)
+    assert "Y_pred" in out["Modelling-1"].keys()
+
+
+def test_core_result_cache_exclusions(tmp_path, capsys):
+    import os
+    from vai_lab.Data.Data_core import Data
+    from vai_lab.Data.image_store import LazyImageDict
+    from vai_lab.Data.result_cache import ResultCache, data_fingerprint
+    image = tmp_path / "image.png"
+    image.write_bytes(b"first")
+    data = Data()
+    data.append_data_column("X", LazyImageDict({"image": str(image)}))
+    before = data_fingerprint(data)
+    image.write_bytes(b"second image")
+    assert data_fingerprint(data) != before
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    saving = {"module_type": "Modelling", "plugin": {"methods": {"_order": ["fit", "save"]}}}
+    assert not cache.is_cacheable(saving)
+
+    filename, _ = _example_config(tmp_path, "ridge_regression_demo.xml")
+    with open(filename) as f:
+        config = f.read()
+    config = config.replace('<Modelling name="Modelling">',
+                            '<loop type="for" condition="2" name="loop0">'
+                            '<Modelling name="Modelling">')
+    config = config.replace('</Modelling>', '</Modelling></loop>')
+    with open(filename, "w") as f:
+        f.write(config)
+    core = Core(headless=True)
+    core.enable_result_cache(str(tmp_path / "cache"))
+    core.load_config_file(filename)
+    core.run()
+    assert not any(f.endswith(".pkl") for f in os.listdir(tmp_path / "cache"))
+
+
+def test_core_events(tmp_path):
+    filename, _ = _example_config(tmp_path, "ridge-scalar-ridge_demo.xml")
+    core = Core(headless=True)
+    events = []
+    core.subscribe(events.append)
+    core.load_config_file(filename)
+    core.run()
+
+    assert events[0]["event"] == "pipeline_start"
+    assert events[-1]["event"] == "pipeline_finish"
+    finished = {e["name"]: e for e in events if e["event"] == "finish"}
+    assert set(finished) == set(core.status_logger)
+    assert all(e["duration"] >= 0 for e in finished.values())
+    assert finished["Modelling"]["data_size"] > 0
+
+
+def test_core_parallel_loop(tmp_path):
+    filename, outpath = _example_config(tmp_path, "ridge_regression_demo.xml")
+    with open(filename) as f:
+        config = f.read()
+    config = config.replace('<Modelling name="Modelling">',
+                            '<loop type="for" condition="3" name="loop0" parallel="true" workers="2">'
+                            '<Modelling name="Modelling">')
+    config = config.replace('</Modelling>', '</Modelling></loop>')
+    with open(filename, "w") as f:
+        f.write(config)
+    core = Core(headless=True)
+    core.load_config_file(filename)
+    assert core._xml_handler.loaded_modules["loop0"]["parallel"] is True
+    events = []
+    core.subscribe(lambda event: events.append((event["event"], event.get("name"))))
+    # Workers run the loaded elements and do not read the config again
+    import os
+    os.remove(filename)
+    core.run()
+
+    assert events.index(("start", "Modelling")) < events.index(("finish", "Modelling")) \
+        < events.index(("finish", "loop0"))
+    assert {"start", "finish", "duration"} <= set(core.status_logger["Modelling"])
+    iterations = core.data["loop0"]["Modelling"]
+    assert len(iterations) == 3
+    assert core.data["Modelling"] is iterations[-1]
+    assert all("Y_pred" in data.keys() for data in iterations)
+    assert outpath.exists()
+
+
+def test_loop_condition():
+    import pytest
+    from vai_lab.Core.loop_condition import LoopCondition, LoopConditionError
+    from vai_lab.Data.Data_core import Data
+    data = {"Modelling": Data()}
+    condition = LoopCondition('abs(improvement("Modelling", "test_score", 2)) < 0.01 '
+                              'or elapsed > 60', data)
+    met = []
+    for i, score in enumerate([0.5, 0.8, 0.9, 0.905, 0.906]):
+        data["Modelling"].append_data_column("test_score", score)
+        met.append(condition.evaluate(i + 1, 0.0))
+    assert met == [False, False, False, False, True]
+
+    # Values are recorded in iterations where improvement is short-circuited
+    data = {"Modelling": Data()}
+    condition = LoopCondition('iteration > 2 and improvement("Modelling", "test_score", 2) < 0.01',
+                              data)
+    met = []
+    for i, score in enumerate([0.5, 0.9, 0.9, 0.9]):
+        data["Modelling"].append_data_column("test_score", score)
+        met.append(condition.evaluate(i + 1, 0.0))
+    assert met == [False, False, False, True]
+    assert LoopCondition('max(value("Modelling", "test_score"), 1) == 1', data).evaluate(1, 0.0)
+
+    for expression in ('__import__("os")', 'value.__class__', 'iteration; 1', 'x > 1'):
+        with pytest.raises(LoopConditionError):
+            LoopCondition(expression, data)
+
+
+def test_core_until_loop(tmp_path):
+    filename, outpath = _example_config(tmp_path, "ridge_regression_demo.xml")
+    with open(filename) as f:
+        config = f.read()
+    config = config.replace('<Modelling name="Modelling">',
+                            '<loop type="until" condition="iteration >= 2 and '
+                            'value(&quot;Modelling&quot;, &quot;test_score&quot;) > 0" '
+                            'name="loop0" max_iter="5"><Modelling name="Modelling">')
+    config = config.replace('</Modelling>', '</Modelling></loop>')
+    with open(filename, "w") as f:
+        f.write(config)
+    core = Core(headless=True)
+    core.load_config_file(filename)
+    core.run()
+
+    assert core.data["loop0"]["iterations"] == 2
+    assert "test_score" in core.data["Modelling"].keys()
+    assert outpath.exists()
+
+
+def test_headless_imports(tmp_path):
+    """A headless regression pipeline does not load the GUI or unused plugin dependencies"""
+    import subprocess
+    import sys
+    filename, _ = _example_config(tmp_path, "ridge_regression_demo.xml")
+    code = ("import sys\n"
+            "import vai_lab\n"
+            "assert 'pandas' not in sys.modules and 'numpy' not in sys.modules\n"
+            "core = vai_lab.Core(headless=True)\n"
+            "core.load_config_file(sys.argv[1])\n"
+            "core.run()\n"
+            "unused = {'tkinter', 'PIL', 'cv2', 'matplotlib', 'pybullet'}\n"
+            "assert not unused & set(sys.modules), unused & set(sys.modules)\n")
+    subprocess.run([sys.executable, "-c", code, filename], check=True,
+                   capture_output=True)
+
+
+def test_core_reset(tmp_path):
+    first, _ = _example_config(tmp_path, "ridge-scalar-ridge_demo.xml")
+    (tmp_path / "second").mkdir()
+    second, outpath = _example_config(tmp_path / "second", "ridge_regression_demo.xml")
+    core = Core(headless=True)
+    core.load_config_file(first)
+    core.run()
+    core.reset()
+    core.load_config_file(second)
+    core.run()
+
+    with open(outpath, "rb") as f:
+        out = pickle.load(f)
+    assert "Modelling-1" not in core.data and "Modelling-1" not in out.keys()
+
+
+def test_batch_runner(tmp_path):
+    from vai_lab.Core.batch_runner import BatchRunner
+    files = []
+    for i in range(2):
+        (tmp_path / str(i)).mkdir()
+        files.append(_example_config(tmp_path / str(i), "ridge_regression_demo.xml"))
+    missing = str(tmp_path / "missing.xml")
+    for processes in (1, 2):
+        results = BatchRunner(processes=processes).run([f for f, _ in files] + [missing])
+        assert [r["status"] for r in results] == ["ok", "ok", "failed"]
+        assert all(outpath.exists() for _, outpath in files)
+        assert "2 succeeded, 1 failed" in BatchRunner.summary(results)
+        for _, outpath in files:
+            outpath.unlink()
+
+
+def test_core_instrumentation(tmp_path):
+    import json
+    filename, _ = _example_config(tmp_path, "ridge-scalar-ridge_demo.xml")
+    core = Core(headless=True)
+    instrumentation = core.enable_instrumentation(trace_memory=True)
+    core.load_config_file(filename)
+    core.run()
+
+    modules = {s["name"]: s for s in instrumentation.spans if s["category"] == "module"}
+    assert set(modules) == {"Modelling", "Data Processing", "Modelling-1"}
+    assert all(s["args"]["input_size"] > 0 and s["args"]["output_size"] > 0
+               for s in modules.values())
+    plugin_calls = instrumentation.summary()
+    assert plugin_calls["RidgeRegression.fit"]["calls"] == 2
+    assert "StandardScaler.transform" in plugin_calls
+    fit = next(s for s in instrumentation.spans if s["name"] == "RidgeRegression.fit")
+    assert fit["mem_peak"] >= 0 and fit["duration"] <= modules["Modelling"]["duration"]
+
+    instrumentation.to_chrome_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == len(instrumentation.spans)
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def test_core_fuse_processing(tmp_path, capsys):
+    import numpy as np
+    filename, outpath = _example_config(tmp_path, "scaler-minmax-ridge_demo.xml")
+    outputs = {}
+    for fuse in (False, True):
+        core = Core(headless=True, fuse_processing=fuse)
+        core.load_config_file(filename)
+        core.run()
+        with open(outpath, "rb") as f:
+            outputs[fuse] = pickle.load(f)["Modelling"]
+
+    assert list(core._chains) == ["Data Processing"]
+    assert core._fused_into == {"Data Processing-1": "Data Processing"}
+    assert "processing in one pass" in capsys.readouterr().out
+    assert np.allclose(np.asarray(outputs[True]["X"]), np.asarray(outputs[False]["X"]))
+    # Unlike separate modules, the chain transforms X_test too
+    X_test = np.asarray(outputs[True]["X_test"])
+    assert X_test.min() >= -0.5 and X_test.max() <= 1.5
+    assert not np.allclose(X_test, np.asarray(outputs[False]["X_test"]))